@@ -56,10 +56,10 @@ try:
 
     # Check-In Progress
     try:
-        from db.queries import get_checkin_stats, get_unresolved_missed
+        from db.queries import get_checkin_stats, get_unresolved_missed_count
 
         stats = get_checkin_stats(student_id)
-        missed = get_unresolved_missed(student_id)
+        missed_count = get_unresolved_missed_count(student_id)
 
         st.markdown("---")
         st.subheader("📈 Check-In Progress")
@@ -74,7 +74,7 @@ try:
             wt = stats.get("week_total", 0)
             st.metric("This Week", f"{wc}/{wt}")
         with c4:
-            st.metric("Missed (Unresolved)", len(missed))
+            st.metric("Missed (Unresolved)", missed_count)
     except Exception:
         pass  # check-in tables may not exist yet
 
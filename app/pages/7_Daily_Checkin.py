@@ -4,6 +4,7 @@ from __future__ import annotations
 import streamlit as st
 import sys
 import importlib
+from collections import Counter
 from pathlib import Path
 from datetime import date, timedelta
 
@@ -31,7 +32,9 @@ try:
         mark_missed_sessions,
         get_sessions_for_date,
         get_unresolved_missed,
+        get_unresolved_missed_count,
         check_in_session,
+        cancel_session,
         find_available_reschedule_slots,
         reschedule_session,
         get_checkin_stats,
@@ -58,6 +61,18 @@ except Exception as e:
     st.error(f"Error connecting to database: {e}")
     st.stop()
 
+# Per-run memo so Today / Weekly / Simulate don't refetch the same date.
+# Plain dict (not session_state) so it resets on every rerun, after mutations.
+_sessions_cache: dict[tuple, list[dict]] = {}
+
+
+def _cached_sessions(sid: str, d: date) -> list[dict]:
+    key = (sid, d)
+    if key not in _sessions_cache:
+        _sessions_cache[key] = get_sessions_for_date(sid, d)
+    return _sessions_cache[key]
+
+
 # ── Student header ───────────────────────────────────────
 student = get_student(student_id)
 if student:
@@ -131,7 +146,9 @@ STATUS_ICONS = {
     "rescheduled": "🔄", "cancelled": "🚫",
 }
 
-sessions = get_sessions_for_date(student_id, current_date)
+RESETTABLE_STATUSES = frozenset({"completed", "missed", "rescheduled", "pending"})
+
+sessions = _cached_sessions(student_id, current_date)
 
 if not sessions:
     st.caption("No classes scheduled for this day.")
@@ -190,12 +207,16 @@ else:
 
 # ── Unresolved Missed Sessions ───────────────────────────
 st.markdown("---")
-missed = get_unresolved_missed(student_id)
+missed_count = get_unresolved_missed_count(student_id)
 
-if missed:
-    st.subheader(f"⚠️ Missed Sessions ({len(missed)})")
+if missed_count:
+    st.subheader(f"⚠️ Missed Sessions ({missed_count})")
     st.caption("These sessions were not checked in and need to be rescheduled or skipped.")
 
+    # Row bodies (and per-row reschedule lookups) are only fetched on demand
+    show_missed = st.toggle("Show missed details")
+    missed = get_unresolved_missed(student_id) if show_missed else []
+
     for m in missed:
         code = m.get("course_code", "")
         title = m.get("course_title", "")
@@ -228,10 +249,7 @@ if missed:
                 st.caption("No available slots found in the next 7 days.")
 
             if st.button("Skip (don't reschedule)", key=f"skip_{m['id']}"):
-                from services.supabase_client import get_supabase
-                get_supabase().table("session_instances").update(
-                    {"status": "cancelled"}
-                ).eq("id", m["id"]).execute()
+                cancel_session(m["id"], student_id)
                 st.toast(f"Skipped {code} on {m_date}")
                 st.rerun()
 
@@ -241,25 +259,26 @@ st.subheader("📊 Weekly Progress")
 
 week_start = current_date - timedelta(days=current_date.weekday())
 day_labels = ["Mon", "Tue", "Wed", "Thu", "Fri"]
+today = date.today()
 cols = st.columns(5)
 
 for i, col in enumerate(cols):
     day = week_start + timedelta(days=i)
-    day_sessions = get_sessions_for_date(student_id, day)
+    day_sessions = _cached_sessions(student_id, day)
 
     with col:
         st.markdown(f"**{day_labels[i]}**")
         st.caption(day.strftime("%b %d"))
 
+        status_counts = Counter(s["status"] for s in day_sessions)
         if not day_sessions:
             st.markdown("—")
-        elif all(s["status"] == "completed" for s in day_sessions):
+        elif status_counts["completed"] == len(day_sessions):
             st.markdown("✅")
-        elif any(s["status"] == "missed" for s in day_sessions):
+        elif status_counts["missed"]:
             st.markdown("❌")
-        elif day >= date.today():
-            pending = sum(1 for s in day_sessions if s["status"] == "pending")
-            st.markdown(f"⏳ {pending}")
+        elif day >= today:
+            st.markdown(f"⏳ {status_counts['pending']}")
         else:
             st.markdown("⏳")
 
@@ -280,7 +299,7 @@ with col3:
     wt = stats.get("week_total", 0)
     st.metric("This Week", f"{wc}/{wt}")
 with col4:
-    st.metric("Missed (Unresolved)", len(missed))
+    st.metric("Missed (Unresolved)", missed_count)
 
 # ── Simulate Missed Day ─────────────────────────────────
 st.markdown("---")
@@ -304,8 +323,8 @@ with sim_col1:
     )
 
 # Show what sessions exist on that date
-sim_sessions = get_sessions_for_date(student_id, sim_date)
-resettable_on_day = [s for s in sim_sessions if s["status"] in ("completed", "missed", "rescheduled", "pending")]
+sim_sessions = _cached_sessions(student_id, sim_date)
+resettable_on_day = [s for s in sim_sessions if s["status"] in RESETTABLE_STATUSES]
 
 with sim_col2:
     st.markdown(f"**{sim_date.strftime('%A, %b %d')}** — {len(sim_sessions)} sessions")
@@ -355,6 +374,9 @@ else:
                 "performed_by": "simulate",
             }).execute()
 
+        # Direct writes above bypass db.queries; drop cached stats
+        _queries_mod._invalidate_checkin_stats(student_id)
+
         # Step 2: Find reschedule slots and reschedule each session
         for s in resettable:
             candidates = find_available_reschedule_slots(student_id, s["id"])
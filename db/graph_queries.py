@@ -1,6 +1,6 @@
 """Neo4j Cypher queries for course prerequisite graph."""
 from __future__ import annotations
-from services.neo4j_client import run_query
+from services.neo4j_client import run_query, run_queries
 
 
 def create_course_node(code: str, title: str, subject: str):
@@ -27,6 +27,71 @@ def create_related_edge(code_a: str, code_b: str, reason: str = ""):
     )
 
 
+# Bulk seeding statements. Kept as fixed strings with all data in $rows so
+# Neo4j's plan cache (keyed by query text) hits on every run.
+_COURSE_NODES_QUERY = (
+    "UNWIND $rows AS r "
+    "MERGE (c:Course {code: r.code}) "
+    "SET c.title = r.title, c.subject = r.subject"
+)
+_PREREQ_EDGES_QUERY = (
+    "UNWIND $rows AS r "
+    "MATCH (a:Course {code: r.from_code}), (b:Course {code: r.to_code}) "
+    "MERGE (a)-[:PREREQUISITE_FOR]->(b)"
+)
+_RELATED_EDGES_QUERY = (
+    "UNWIND $rows AS r "
+    "MATCH (a:Course {code: r.code_a}), (b:Course {code: r.code_b}) "
+    "MERGE (a)-[:RELATED_TO {reason: r.reason}]->(b)"
+)
+_CLEAR_ALL_QUERY = "MATCH (n) DETACH DELETE n"
+
+
+def _course_nodes_query(courses: list[dict]) -> tuple[str, dict]:
+    return (
+        _COURSE_NODES_QUERY,
+        {"rows": [
+            {"code": c["code"], "title": c["title"], "subject": c["subject"]}
+            for c in courses
+        ]},
+    )
+
+
+def _prerequisite_edges_query(pairs: list[tuple[str, str]]) -> tuple[str, dict]:
+    return (
+        _PREREQ_EDGES_QUERY,
+        {"rows": [{"from_code": a, "to_code": b} for a, b in pairs]},
+    )
+
+
+def _related_edges_query(triples: list[tuple[str, str, str]]) -> tuple[str, dict]:
+    return (
+        _RELATED_EDGES_QUERY,
+        {"rows": [{"code_a": a, "code_b": b, "reason": reason} for a, b, reason in triples]},
+    )
+
+
+def seed_course_graph(
+    courses: list[dict],
+    prereq_pairs: list[tuple[str, str]],
+    related_triples: list[tuple[str, str, str]],
+    replace: bool = False,
+):
+    """Create course nodes, then prerequisite and related edges.
+
+    Everything runs as one write transaction; with ``replace`` the existing
+    graph is cleared first inside that same transaction.
+    """
+    queries = [
+        _course_nodes_query(courses),
+        _prerequisite_edges_query(prereq_pairs),
+        _related_edges_query(related_triples),
+    ]
+    if replace:
+        queries.insert(0, (_CLEAR_ALL_QUERY, {}))
+    run_queries(queries)
+
+
 def get_prerequisites(course_code: str) -> list[dict]:
     """Get all direct prerequisites for a course."""
     return run_query(
@@ -79,4 +144,4 @@ def get_next_courses(course_code: str) -> list[dict]:
 
 def clear_all_graph_data():
     """Remove all nodes and relationships. Use for re-seeding."""
-    run_query("MATCH (n) DETACH DELETE n")
+    run_query(_CLEAR_ALL_QUERY)
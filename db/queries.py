@@ -1,10 +1,40 @@
 """Supabase CRUD operations for all tables."""
 from __future__ import annotations
+import time
+from bisect import bisect_left
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
 from typing import Optional
 from uuid import UUID
+from postgrest.exceptions import APIError
 from services.supabase_client import get_supabase
 
 
+# Small pool for overlapping independent REST reads; the client is thread-safe.
+_io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="supabase-io")
+
+
+def _run_concurrently(*calls) -> list:
+    """Run zero-arg callables in parallel and return their results in order.
+
+    ``None`` entries are skipped and yield ``None``. Exceptions propagate.
+    """
+    futures = [_io_pool.submit(fn) if fn is not None else None for fn in calls]
+    return [f.result() if f is not None else None for f in futures]
+
+
+# Error codes meaning an optional migration (scripts/*.sql) hasn't been run:
+# Postgres "undefined_table" and PostgREST's "relation not in schema cache".
+_MISSING_RELATION_CODES = frozenset({"42P01", "PGRST205"})
+# Postgres "undefined_function" and PostgREST's "function not found".
+_MISSING_FUNCTION_CODES = frozenset({"42883", "PGRST202"})
+
+
+def _is_missing(exc: APIError, codes: frozenset) -> bool:
+    return getattr(exc, "code", None) in codes
+
+
 # ── Students ──────────────────────────────────────────────
 
 def get_all_students() -> list[dict]:
@@ -60,9 +90,9 @@ def insert_course(data: dict) -> dict:
 
 # ── Availability ──────────────────────────────────────────
 
-def get_student_availability(student_id: str) -> list[dict]:
+def get_student_availability(student_id: str, sb=None) -> list[dict]:
     return (
-        get_supabase()
+        (sb or get_supabase())
         .table("availability")
         .select("*")
         .eq("student_id", student_id)
@@ -91,6 +121,41 @@ def get_student_schedules(student_id: str, status: Optional[str] = None) -> list
     return q.order("start_date").execute().data
 
 
+# Narrow projection + short-lived memo for the internal session/slot helpers.
+# One page render calls several of them for the same student; the TTL keeps
+# them on a single fetch without serving stale data across renders.
+_SCHEDULE_REFS_SELECT = "id, student_id, start_date, status, courses(code, title, subject)"
+_SCHEDULE_REFS_TTL = 5.0
+_schedule_refs_cache: dict[str, tuple[float, list[dict]]] = {}
+
+
+def _get_active_schedule_refs(student_id: str, sb=None) -> list[dict]:
+    """Active schedules with only course code/title/subject. Treat as read-only."""
+    now = time.monotonic()
+    hit = _schedule_refs_cache.get(student_id)
+    if hit and now - hit[0] < _SCHEDULE_REFS_TTL:
+        return hit[1]
+    refs = (
+        (sb or get_supabase())
+        .table("schedules")
+        .select(_SCHEDULE_REFS_SELECT)
+        .eq("student_id", student_id)
+        .eq("status", "active")
+        .order("start_date")
+        .execute()
+        .data
+    )
+    _schedule_refs_cache[student_id] = (now, refs)
+    return refs
+
+
+def _invalidate_schedule_refs(student_id: Optional[str] = None):
+    if student_id is None:
+        _schedule_refs_cache.clear()
+    else:
+        _schedule_refs_cache.pop(student_id, None)
+
+
 def get_schedule(schedule_id: str) -> Optional[dict]:
     resp = (
         get_supabase()
@@ -103,11 +168,13 @@ def get_schedule(schedule_id: str) -> Optional[dict]:
 
 
 def insert_schedule(data: dict) -> dict:
-    return get_supabase().table("schedules").insert(data).execute().data[0]
+    row = get_supabase().table("schedules").insert(data).execute().data[0]
+    _invalidate_schedule_refs(row.get("student_id"))
+    return row
 
 
 def update_schedule_status(schedule_id: str, status: str) -> dict:
-    return (
+    row = (
         get_supabase()
         .table("schedules")
         .update({"status": status})
@@ -115,13 +182,15 @@ def update_schedule_status(schedule_id: str, status: str) -> dict:
         .execute()
         .data[0]
     )
+    _invalidate_schedule_refs(row.get("student_id"))
+    return row
 
 
 # ── Schedule Slots ────────────────────────────────────────
 
-def get_schedule_slots(schedule_id: str) -> list[dict]:
+def get_schedule_slots(schedule_id: str, sb=None) -> list[dict]:
     return (
-        get_supabase()
+        (sb or get_supabase())
         .table("schedule_slots")
         .select("*")
         .eq("schedule_id", schedule_id)
@@ -134,14 +203,25 @@ def get_schedule_slots(schedule_id: str) -> list[dict]:
 
 def get_student_all_slots(student_id: str) -> list[dict]:
     """Get all schedule slots for a student across all active schedules."""
-    schedules = get_student_schedules(student_id, status="active")
-    all_slots = []
-    for sch in schedules:
-        slots = get_schedule_slots(sch["id"])
-        for s in slots:
-            s["course_title"] = sch.get("courses", {}).get("title", "")
-            s["course_code"] = sch.get("courses", {}).get("code", "")
-        all_slots.extend(slots)
+    schedules = _get_active_schedule_refs(student_id)
+    if not schedules:
+        return []
+
+    course_lookup = {sch["id"]: sch.get("courses") or {} for sch in schedules}
+    all_slots = (
+        get_supabase()
+        .table("schedule_slots")
+        .select("*")
+        .in_("schedule_id", list(course_lookup))
+        .order("day_of_week")
+        .order("start_time")
+        .execute()
+        .data
+    )
+    for s in all_slots:
+        course = course_lookup.get(s["schedule_id"], {})
+        s["course_title"] = course.get("title", "")
+        s["course_code"] = course.get("code", "")
     return all_slots
 
 
@@ -210,26 +290,53 @@ def upsert_conversation(data: dict) -> dict:
     return get_supabase().table("agent_conversations").upsert(data).execute().data[0]
 
 
+def append_conversation_message(conv_id: str, message: dict) -> None:
+    """Append one message server-side instead of re-sending the whole history."""
+    get_supabase().rpc(
+        "append_conversation_msg", {"p_id": conv_id, "p_msg": [message]}
+    ).execute()
+
+
 # ── Session Instances (Check-In / 打卡) ─────────────────
 
 def generate_session_instances(schedule_id: str, start_date, end_date) -> list[dict]:
     """Expand weekly template slots into concrete dated session instances.
 
     For each schedule_slot, creates one session_instance row per week
-    between start_date and end_date.
+    between start_date and end_date. The expansion runs server-side in the
+    ``generate_sessions`` RPC (scripts/add_rpc_functions.sql); existing
+    instances are left untouched. Returns the newly created rows.
     """
-    from datetime import date as _date, timedelta
-
     if isinstance(start_date, str):
-        start_date = _date.fromisoformat(start_date)
+        start_date = date.fromisoformat(start_date)
     if isinstance(end_date, str):
-        end_date = _date.fromisoformat(end_date)
+        end_date = date.fromisoformat(end_date)
 
-    slots = get_schedule_slots(schedule_id)
+    sb = get_supabase()
+    try:
+        rows = sb.rpc("generate_sessions", {
+            "p_schedule": schedule_id,
+            "p_start": str(start_date),
+            "p_end": str(end_date),
+        }).execute().data
+    except APIError as e:
+        if not _is_missing(e, _MISSING_FUNCTION_CODES):
+            raise
+        # RPC not installed (add_rpc_functions.sql); expand client-side
+        rows = _generate_session_instances_local(sb, schedule_id, start_date, end_date)
+
+    # New sessions change completion totals; the schedule's owner isn't
+    # known here, so drop every cached stats entry
+    _invalidate_checkin_stats()
+    return rows
+
+
+def _generate_session_instances_local(sb, schedule_id: str, start_date: date, end_date: date) -> list[dict]:
+    """Client-side expansion used when the RPC is unavailable."""
+    slots = get_schedule_slots(schedule_id, sb=sb)
     if not slots:
         return []
 
-    sb = get_supabase()
     all_instances = []
 
     # Find the Monday of the week containing start_date
@@ -254,101 +361,98 @@ def generate_session_instances(schedule_id: str, start_date, end_date) -> list[d
 
     if all_instances:
         result = sb.table("session_instances").upsert(
-            all_instances, on_conflict="schedule_slot_id,session_date"
+            all_instances,
+            on_conflict="schedule_slot_id,session_date",
+            ignore_duplicates=True,
         ).execute()
         return result.data
 
     return []
 
 
-def get_sessions_for_date(student_id: str, target_date) -> list[dict]:
-    """Get all session instances for a student on a specific date, with course info."""
-    from datetime import date as _date
-    if isinstance(target_date, str):
-        target_date = _date.fromisoformat(target_date)
+def _attach_course_info(rows: list[dict], course_lookup: dict) -> list[dict]:
+    """Copy course code/title/subject onto session rows from a schedule_id lookup."""
+    for row in rows:
+        course = course_lookup.get(row["schedule_id"], {})
+        row["course_code"] = course.get("code", "")
+        row["course_title"] = course.get("title", "")
+        row["subject"] = course.get("subject", "")
+    return rows
 
-    schedules = get_student_schedules(student_id, status="active")
-    if not schedules:
-        return []
 
-    schedule_ids = [s["id"] for s in schedules]
-    # Build course lookup
-    course_lookup = {}
-    for s in schedules:
-        course_lookup[s["id"]] = s.get("courses", {})
+# Joined session_instances + schedules + courses (scripts/add_checkin_tables.sql)
+SESSION_VIEW = "v_session_today"
 
-    sb = get_supabase()
-    all_sessions = []
-    for sid in schedule_ids:
-        resp = (
-            sb.table("session_instances")
+
+def _select_sessions(student_id: str, build, sb=None) -> list[dict]:
+    """Fetch a student's session rows (active schedules) with course info.
+
+    ``build`` adds filters/ordering to the base query. Reads the joined view
+    in one request; falls back to schedule refs + session_instances if the
+    view hasn't been created yet.
+    """
+    sb = sb or get_supabase()
+    try:
+        query = (
+            sb.table(SESSION_VIEW)
             .select("*")
-            .eq("schedule_id", sid)
-            .eq("session_date", str(target_date))
-            .order("start_time")
-            .execute()
+            .eq("student_id", student_id)
+            .eq("schedule_status", "active")
         )
-        for row in resp.data:
-            course = course_lookup.get(row["schedule_id"], {})
-            row["course_code"] = course.get("code", "")
-            row["course_title"] = course.get("title", "")
-            row["subject"] = course.get("subject", "")
-            all_sessions.append(row)
+        return build(query).execute().data
+    except APIError as e:
+        if not _is_missing(e, _MISSING_RELATION_CODES):
+            raise
+        # View not created yet (add_checkin_tables.sql); use the two-step path
 
-    all_sessions.sort(key=lambda x: str(x.get("start_time", "")))
-    return all_sessions
+    schedules = _get_active_schedule_refs(student_id, sb=sb)
+    if not schedules:
+        return []
+
+    course_lookup = {s["id"]: s.get("courses") or {} for s in schedules}
+    query = sb.table("session_instances").select("*").in_("schedule_id", list(course_lookup))
+    return _attach_course_info(build(query).execute().data, course_lookup)
 
 
-def get_sessions_for_range(student_id: str, start_date, end_date) -> list[dict]:
+def get_sessions_for_date(student_id: str, target_date) -> list[dict]:
+    """Get all session instances for a student on a specific date, with course info."""
+    if isinstance(target_date, str):
+        target_date = date.fromisoformat(target_date)
+
+    return _select_sessions(
+        student_id,
+        lambda q: q.eq("session_date", str(target_date)).order("start_time"),
+    )
+
+
+def get_sessions_for_range(student_id: str, start_date, end_date, sb=None) -> list[dict]:
     """Get all sessions in a date range for the calendar view."""
-    from datetime import date as _date
     if isinstance(start_date, str):
-        start_date = _date.fromisoformat(start_date)
+        start_date = date.fromisoformat(start_date)
     if isinstance(end_date, str):
-        end_date = _date.fromisoformat(end_date)
-
-    schedules = get_student_schedules(student_id, status="active")
-    if not schedules:
-        return []
-
-    course_lookup = {}
-    for s in schedules:
-        course_lookup[s["id"]] = s.get("courses", {})
+        end_date = date.fromisoformat(end_date)
 
-    sb = get_supabase()
-    all_sessions = []
-    for sch in schedules:
-        resp = (
-            sb.table("session_instances")
-            .select("*")
-            .eq("schedule_id", sch["id"])
-            .gte("session_date", str(start_date))
+    return _select_sessions(
+        student_id,
+        lambda q: (
+            q.gte("session_date", str(start_date))
             .lte("session_date", str(end_date))
             .order("session_date")
             .order("start_time")
-            .execute()
-        )
-        for row in resp.data:
-            course = course_lookup.get(row["schedule_id"], {})
-            row["course_code"] = course.get("code", "")
-            row["course_title"] = course.get("title", "")
-            row["subject"] = course.get("subject", "")
-            all_sessions.append(row)
-
-    return all_sessions
+        ),
+        sb=sb,
+    )
 
 
 def get_pending_sessions_today(student_id: str) -> list[dict]:
     """Get sessions with status='pending' for today."""
-    from datetime import date as _date
-    today = _date.today()
+    today = date.today()
     sessions = get_sessions_for_date(student_id, today)
     return [s for s in sessions if s.get("status") == "pending"]
 
 
 def check_in_session(session_id: str, notes: str = None) -> dict:
     """Mark a session as completed (打卡)."""
-    from datetime import datetime, timezone
     sb = get_supabase()
     now = datetime.now(timezone.utc).isoformat()
 
@@ -359,6 +463,8 @@ def check_in_session(session_id: str, notes: str = None) -> dict:
         .execute()
     )
 
+    _invalidate_checkin_stats()
+
     # Log the action
     sb.table("checkin_log").insert({
         "session_instance_id": session_id,
@@ -370,6 +476,18 @@ def check_in_session(session_id: str, notes: str = None) -> dict:
     return result.data[0] if result.data else {}
 
 
+def cancel_session(session_id: str, student_id: Optional[str] = None) -> dict:
+    """Cancel a session without rescheduling it (e.g. skip a missed class)."""
+    result = (
+        get_supabase().table("session_instances")
+        .update({"status": "cancelled"})
+        .eq("id", session_id)
+        .execute()
+    )
+    _invalidate_checkin_stats(student_id)
+    return result.data[0] if result.data else {}
+
+
 def mark_missed_sessions(
     student_id: str = None, auto_reschedule: bool = True
 ) -> dict:
@@ -382,9 +500,8 @@ def mark_missed_sessions(
 
     Returns dict with 'missed' and 'rescheduled' lists.
     """
-    from datetime import date as _date
     sb = get_supabase()
-    today = str(_date.today())
+    today = str(date.today())
 
     q = (
         sb.table("session_instances")
@@ -395,35 +512,58 @@ def mark_missed_sessions(
 
     if student_id:
         # Filter by student's schedule IDs
-        schedules = get_student_schedules(student_id, status="active")
+        schedules = _get_active_schedule_refs(student_id, sb=sb)
         schedule_ids = [s["id"] for s in schedules]
         if not schedule_ids:
             return {"missed": [], "rescheduled": []}
         q = q.in_("schedule_id", schedule_ids)
 
     pending_past = q.execute().data
+    if not pending_past:
+        return {"missed": [], "rescheduled": []}
 
-    missed = []
-    rescheduled = []
-    for session in pending_past:
-        sb.table("session_instances").update(
-            {"status": "missed"}
-        ).eq("id", session["id"]).execute()
+    # One UPDATE and one log INSERT for the whole batch
+    sb.table("session_instances").update(
+        {"status": "missed"}
+    ).in_("id", [s["id"] for s in pending_past]).execute()
 
-        sb.table("checkin_log").insert({
-            "session_instance_id": session["id"],
+    sb.table("checkin_log").insert([
+        {
+            "session_instance_id": s["id"],
             "action": "auto_miss",
             "performed_by": "system",
-        }).execute()
+        }
+        for s in pending_past
+    ]).execute()
+    _invalidate_checkin_stats(student_id)
 
+    missed = []
+    for session in pending_past:
         session["status"] = "missed"
         missed.append(session)
 
-        # Auto-reschedule: pick the best available slot
-        if auto_reschedule and student_id:
+    rescheduled = []
+    if auto_reschedule and student_id:
+        # Fetched once and shared by every candidate search below; each new
+        # booking is appended to `existing` so later sessions avoid it.
+        try:
+            tomorrow = date.today() + timedelta(days=1)
+            avail, existing = _run_concurrently(
+                lambda: get_student_availability(student_id, sb=sb),
+                lambda: get_sessions_for_range(
+                    student_id, tomorrow, date.today() + timedelta(days=7), sb=sb
+                ),
+            )
+        except Exception:
+            return {"missed": missed, "rescheduled": rescheduled}
+
+        reschedule_logs = []
+        for session in missed:
+            # Auto-reschedule: pick the best available slot
             try:
                 candidates = find_available_reschedule_slots(
-                    student_id, session["id"], days_ahead=7
+                    student_id, session["id"], days_ahead=7,
+                    avail=avail, existing=existing,
                 )
                 if candidates:
                     best = candidates[0]  # first = highest preference, earliest date
@@ -431,8 +571,8 @@ def mark_missed_sessions(
                         session["id"], best["date"], best["start_time"], best["end_time"]
                     )
                     if new_inst and "error" not in new_inst:
-                        # Update the log entry to reflect auto-reschedule
-                        sb.table("checkin_log").insert({
+                        existing.append(new_inst)
+                        reschedule_logs.append({
                             "session_instance_id": session["id"],
                             "action": "reschedule",
                             "performed_by": "system",
@@ -441,7 +581,7 @@ def mark_missed_sessions(
                                 "new_date": best["date"],
                                 "new_time": f"{best['start_time']}–{best['end_time']}",
                             },
-                        }).execute()
+                        })
                         rescheduled.append({
                             "missed_session": session,
                             "new_date": best["date"],
@@ -452,143 +592,209 @@ def mark_missed_sessions(
             except Exception:
                 pass  # reschedule failure shouldn't block marking as missed
 
+        if reschedule_logs:
+            try:
+                sb.table("checkin_log").insert(reschedule_logs).execute()
+            except Exception:
+                pass
+
     return {"missed": missed, "rescheduled": rescheduled}
 
 
 def get_unresolved_missed(student_id: str) -> list[dict]:
     """Get missed sessions that haven't been rescheduled yet."""
-    schedules = get_student_schedules(student_id, status="active")
+    return _select_sessions(
+        student_id,
+        lambda q: q.eq("status", "missed").is_("rescheduled_to", "null").order("session_date"),
+    )
+
+
+def get_unresolved_missed_count(student_id: str) -> int:
+    """Count unresolved missed sessions without fetching the rows."""
+    schedules = _get_active_schedule_refs(student_id)
     if not schedules:
-        return []
+        return 0
 
-    course_lookup = {}
-    for s in schedules:
-        course_lookup[s["id"]] = s.get("courses", {})
+    resp = (
+        get_supabase()
+        .table("session_instances")
+        .select("id", count="exact", head=True)
+        .in_("schedule_id", [s["id"] for s in schedules])
+        .eq("status", "missed")
+        .is_("rescheduled_to", "null")
+        .execute()
+    )
+    return resp.count or 0
+
+
+_DOW_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+_PREF_RANK = {"preferred": 0, "available": 1, "avoid": 2}
 
-    sb = get_supabase()
-    all_missed = []
-    for sch in schedules:
-        resp = (
-            sb.table("session_instances")
-            .select("*")
-            .eq("schedule_id", sch["id"])
-            .eq("status", "missed")
-            .is_("rescheduled_to", "null")
-            .order("session_date")
-            .execute()
-        )
-        for row in resp.data:
-            course = course_lookup.get(row["schedule_id"], {})
-            row["course_code"] = course.get("code", "")
-            row["course_title"] = course.get("title", "")
-            row["subject"] = course.get("subject", "")
-            all_missed.append(row)
 
-    return all_missed
+def _to_minutes(t) -> int:
+    """'HH:MM[:SS]' (or datetime.time) -> minutes since midnight."""
+    t = str(t)
+    return int(t[:2]) * 60 + int(t[3:5])
 
 
 def find_available_reschedule_slots(
-    student_id: str, missed_session_id: str, days_ahead: int = 14
+    student_id: str,
+    missed_session_id: str,
+    days_ahead: int = 14,
+    avail: Optional[list[dict]] = None,
+    existing: Optional[list[dict]] = None,
 ) -> list[dict]:
     """Find available dates/times to reschedule a missed session.
 
-    Slides through each availability window in 30-min increments to find
-    a gap that fits the session duration. Returns up to 5 candidate slots
-    sorted by preference then date.
+    Runs the search server-side via the ``find_reschedule_slots`` RPC
+    (scripts/add_rpc_functions.sql) in a single round-trip. Falls back to
+    the client-side search if the function hasn't been installed yet.
+
+    Callers that already hold the student's availability and the sessions
+    in the search range can pass them as ``avail`` / ``existing``; the
+    search then runs locally without refetching them.
     """
-    from datetime import date as _date, timedelta
+    if avail is not None and existing is not None:
+        return _find_reschedule_slots_local(
+            student_id, missed_session_id, days_ahead, avail=avail, existing=existing
+        )
+    try:
+        return (
+            get_supabase()
+            .rpc("find_reschedule_slots", {
+                "p_student": student_id,
+                "p_session": missed_session_id,
+                "p_days_ahead": days_ahead,
+            })
+            .execute()
+            .data
+        )
+    except APIError as e:
+        if not _is_missing(e, _MISSING_FUNCTION_CODES):
+            raise
+        # RPC not installed (add_rpc_functions.sql); search client-side
+        return _find_reschedule_slots_local(student_id, missed_session_id, days_ahead)
+
 
+def _find_reschedule_slots_local(
+    student_id: str,
+    missed_session_id: str,
+    days_ahead: int = 14,
+    avail: Optional[list[dict]] = None,
+    existing: Optional[list[dict]] = None,
+) -> list[dict]:
+    """Client-side reschedule search used when the RPC is unavailable.
+
+    Walks each availability window, jumping past busy sessions, to find
+    the earliest gap that fits the session duration. Returns up to 5
+    candidate slots sorted by preference then date.
+    """
     sb = get_supabase()
-    session = sb.table("session_instances").select("*").eq("id", missed_session_id).execute()
+    today = date.today()
+    tomorrow = today + timedelta(days=1)
+    end_search = today + timedelta(days=days_ahead)
+
+    # The missed row, availability and existing sessions are independent
+    # reads; fetch whichever the caller didn't supply concurrently.
+    session, fetched_avail, fetched_existing = _run_concurrently(
+        lambda: sb.table("session_instances").select("*").eq("id", missed_session_id).execute(),
+        (lambda: get_student_availability(student_id, sb=sb)) if avail is None else None,
+        (lambda: get_sessions_for_range(student_id, tomorrow, end_search, sb=sb)) if existing is None else None,
+    )
     if not session.data:
         return []
     missed = session.data[0]
+    if avail is None:
+        avail = fetched_avail
+    if existing is None:
+        existing = fetched_existing
 
     # Session duration in minutes
-    start_parts = str(missed["start_time"])[:5].split(":")
-    end_parts = str(missed["end_time"])[:5].split(":")
-    duration_min = (int(end_parts[0]) * 60 + int(end_parts[1])) - (int(start_parts[0]) * 60 + int(start_parts[1]))
-
-    today = _date.today()
-    tomorrow = today + timedelta(days=1)
-    end_search = today + timedelta(days=days_ahead)
+    duration_min = _to_minutes(missed["end_time"]) - _to_minutes(missed["start_time"])
 
-    # Student availability by day-of-week
-    avail = get_student_availability(student_id)
-    avail_by_dow: dict[int, list] = {}
+    # Student availability by day-of-week, as
+    # (start_min, end_min, preference, preference_rank)
+    windows_by_dow: dict[int, list[tuple]] = {}
     for a in avail:
-        avail_by_dow.setdefault(a["day_of_week"], []).append(a)
-
-    # Existing sessions (non-cancelled) in the search range, keyed by date string
-    existing = get_sessions_for_range(student_id, tomorrow, end_search)
-    existing_by_date: dict[str, list] = {}
+        preference = a.get("preference", "available")
+        windows_by_dow.setdefault(a["day_of_week"], []).append((
+            _to_minutes(a["start_time"]),
+            _to_minutes(a["end_time"]),
+            preference,
+            _PREF_RANK.get(preference, 9),
+        ))
+    for windows in windows_by_dow.values():
+        windows.sort()
+
+    # Existing sessions (non-cancelled) in the search range, keyed by date
+    # string, as minute intervals sorted by start
+    intervals_by_date: dict[str, list[tuple[int, int]]] = {}
     for e in existing:
-        if e.get("status") not in ("cancelled", "rescheduled"):
-            existing_by_date.setdefault(e["session_date"], []).append(e)
-
-    day_names = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    candidates = []
+        if e.get("status") not in ("cancelled", "rescheduled") and e["session_date"] <= str(end_search):
+            intervals_by_date.setdefault(e["session_date"], []).append(
+                (_to_minutes(e["start_time"]), _to_minutes(e["end_time"]))
+            )
+
+    # Per date: busy starts plus running max of busy ends, so the busy
+    # intervals overlapping [probe, probe_end) are found with one bisect.
+    busy_by_date: dict[str, tuple[list[int], list[int]]] = {}
+    for d, intervals in intervals_by_date.items():
+        intervals.sort()
+        starts = [s for s, _ in intervals]
+        max_ends = []
+        running = -1
+        for _, e in intervals:
+            running = max(running, e)
+            max_ends.append(running)
+        busy_by_date[d] = (starts, max_ends)
+
+    # Candidates as (pref_rank, date_str, seq, start_min, end_min, dow,
+    # preference); seq keeps discovery order among equal rank/date, so a
+    # plain tuple sort matches the preference-then-date ordering.
+    candidates: list[tuple] = []
     current = tomorrow
     while current <= end_search and len(candidates) < 10:
         dow = current.weekday()
-        if dow not in avail_by_dow:
+        if dow not in windows_by_dow:
             current += timedelta(days=1)
             continue
 
-        # Build sorted list of busy intervals for this day
-        day_busy = []
-        for ex in existing_by_date.get(str(current), []):
-            ex_s = str(ex["start_time"])[:5]
-            ex_e = str(ex["end_time"])[:5]
-            day_busy.append((
-                int(ex_s[:2]) * 60 + int(ex_s[3:5]),
-                int(ex_e[:2]) * 60 + int(ex_e[3:5]),
-            ))
-        day_busy.sort()
-
-        for window in avail_by_dow[dow]:
-            w_start = str(window["start_time"])[:5]
-            w_end = str(window["end_time"])[:5]
-            w_s_min = int(w_start[:2]) * 60 + int(w_start[3:5])
-            w_e_min = int(w_end[:2]) * 60 + int(w_end[3:5])
-
-            if w_e_min - w_s_min < duration_min:
-                continue
-
-            # Slide through the window in 30-min steps
+        date_str = str(current)
+        starts, max_ends = busy_by_date.get(date_str, ((), ()))
+
+        for w_s_min, w_e_min, preference, rank in windows_by_dow[dow]:
             probe = w_s_min
             while probe + duration_min <= w_e_min:
                 probe_end = probe + duration_min
 
-                conflict = any(
-                    probe < busy_end and busy_start < probe_end
-                    for busy_start, busy_end in day_busy
-                )
+                # Busy intervals starting before probe_end; the latest end
+                # among them decides both conflict and where to jump.
+                idx = bisect_left(starts, probe_end)
+                latest_end = max_ends[idx - 1] if idx else -1
 
-                if not conflict:
-                    candidates.append({
-                        "date": str(current),
-                        "day_name": day_names[dow],
-                        "start_time": f"{probe // 60:02d}:{probe % 60:02d}",
-                        "end_time": f"{probe_end // 60:02d}:{probe_end % 60:02d}",
-                        "preference": window.get("preference", "available"),
-                    })
-                    break  # one slot per window is enough
-                else:
-                    # Jump past the conflicting session
-                    next_start = max(
-                        busy_end for busy_start, busy_end in day_busy
-                        if probe < busy_end and busy_start < probe_end
+                if latest_end <= probe:
+                    candidates.append(
+                        (rank, date_str, len(candidates), probe, probe_end, dow, preference)
                     )
-                    probe = next_start
+                    break  # one slot per window is enough
+                # Jump past the conflicting session
+                probe = latest_end
 
         current += timedelta(days=1)
 
     # Sort: preferred > available, then earliest date
-    pref_order = {"preferred": 0, "available": 1, "avoid": 2}
-    candidates.sort(key=lambda c: (pref_order.get(c["preference"], 9), c["date"]))
-
-    return candidates[:5]
+    candidates.sort()
+
+    return [
+        {
+            "date": date_str,
+            "day_name": _DOW_NAMES[dow],
+            "start_time": f"{start // 60:02d}:{start % 60:02d}",
+            "end_time": f"{end // 60:02d}:{end % 60:02d}",
+            "preference": preference,
+        }
+        for _, date_str, _, start, end, dow, preference in candidates[:5]
+    ]
 
 
 def reschedule_session(
@@ -604,8 +810,6 @@ def reschedule_session(
     missed = missed.data[0]
 
     # Create new instance
-    from datetime import date as _date
-    new_d = _date.fromisoformat(new_date)
     new_instance = sb.table("session_instances").insert({
         "schedule_id": missed["schedule_id"],
         "schedule_slot_id": missed["schedule_slot_id"],
@@ -622,6 +826,8 @@ def reschedule_session(
         "rescheduled_to": new_instance["id"],
     }).eq("id", missed_session_id).execute()
 
+    _invalidate_checkin_stats()
+
     # Log
     sb.table("checkin_log").insert({
         "session_instance_id": missed_session_id,
@@ -633,11 +839,32 @@ def reschedule_session(
     return new_instance
 
 
+# Stats only change on check-in / miss / reschedule, which invalidate this.
+_CHECKIN_STATS_TTL = 30.0
+_checkin_stats_cache: dict[str, tuple[float, dict]] = {}
+
+
+def _invalidate_checkin_stats(student_id: Optional[str] = None):
+    if student_id is None:
+        _checkin_stats_cache.clear()
+    else:
+        _checkin_stats_cache.pop(student_id, None)
+
+
 def get_checkin_stats(student_id: str) -> dict:
-    """Return check-in completion statistics."""
-    from datetime import date as _date, timedelta
+    """Return check-in completion statistics (memoized for a short TTL)."""
+    now = time.monotonic()
+    hit = _checkin_stats_cache.get(student_id)
+    if hit and now - hit[0] < _CHECKIN_STATS_TTL:
+        return dict(hit[1])
+    stats = _compute_checkin_stats(student_id)
+    _checkin_stats_cache[student_id] = (now, stats)
+    return dict(stats)
+
 
-    schedules = get_student_schedules(student_id, status="active")
+def _compute_checkin_stats(student_id: str) -> dict:
+    sb = get_supabase()
+    schedules = _get_active_schedule_refs(student_id, sb=sb)
     if not schedules:
         return {
             "total": 0, "completed": 0, "missed": 0,
@@ -645,44 +872,46 @@ def get_checkin_stats(student_id: str) -> dict:
             "completion_rate": 0.0, "streak": 0,
         }
 
-    sb = get_supabase()
-    today = _date.today()
+    today = date.today()
 
     # All sessions up to and including today
-    all_sessions = []
-    for sch in schedules:
-        resp = (
-            sb.table("session_instances")
-            .select("*")
-            .eq("schedule_id", sch["id"])
-            .lte("session_date", str(today))
-            .order("session_date", desc=True)
-            .execute()
-        )
-        all_sessions.extend(resp.data)
+    all_sessions = (
+        sb.table("session_instances")
+        .select("*")
+        .in_("schedule_id", [s["id"] for s in schedules])
+        .lte("session_date", str(today))
+        .order("session_date", desc=True)
+        .execute()
+        .data
+    )
 
     total = len(all_sessions)
-    completed = sum(1 for s in all_sessions if s["status"] == "completed")
-    missed = sum(1 for s in all_sessions if s["status"] == "missed")
-    rescheduled = sum(1 for s in all_sessions if s["status"] == "rescheduled")
-    pending = sum(1 for s in all_sessions if s["status"] == "pending")
+    status_counts = Counter(s["status"] for s in all_sessions)
+    completed = status_counts["completed"]
+    missed = status_counts["missed"]
+    rescheduled = status_counts["rescheduled"]
+    pending = status_counts["pending"]
 
     # Completion rate (exclude pending today)
     past_total = total - pending
     completion_rate = completed / past_total if past_total > 0 else 0.0
 
     # Current streak: consecutive days with all sessions completed
+    statuses_by_date: dict[str, list[str]] = {}
+    for s in all_sessions:
+        statuses_by_date.setdefault(s["session_date"], []).append(s["status"])
+
     streak = 0
     check_date = today - timedelta(days=1)  # Start from yesterday
     while True:
-        day_sessions = [s for s in all_sessions if s["session_date"] == str(check_date)]
-        if not day_sessions:
+        day_statuses = statuses_by_date.get(str(check_date))
+        if not day_statuses:
             # No sessions on this day, skip (weekends etc.)
             check_date -= timedelta(days=1)
             if check_date < today - timedelta(days=30):
                 break
             continue
-        if all(s["status"] == "completed" for s in day_sessions):
+        if all(st == "completed" for st in day_statuses):
             streak += 1
             check_date -= timedelta(days=1)
         else:
@@ -1,13 +1,61 @@
 """Pinecone vector operations for semantic course search."""
 from __future__ import annotations
+import threading
 from typing import Optional
 from services.pinecone_client import get_index
 
+# Pinecone accepts up to 100 vectors per upsert request.
+UPSERT_BATCH_SIZE = 100
+
+_pending = threading.local()
+
+
+def _normalize(embedding: list[float]) -> list[float]:
+    """L2-normalize so the cosine index doesn't have to per query."""
+    import numpy as np
+
+    v = np.asarray(embedding, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    if norm:
+        v /= norm
+    return v.tolist()
+
+
+def _upsert_batch(index, items: list[dict]):
+    for i in range(0, len(items), UPSERT_BATCH_SIZE):
+        index.upsert(vectors=items[i:i + UPSERT_BATCH_SIZE])
+
+
+def upsert_course_embeddings(batch: list[tuple[str, list[float], dict]]):
+    """Store many course embeddings, UPSERT_BATCH_SIZE vectors per request."""
+    items = [
+        {"id": course_id, "values": _normalize(embedding), "metadata": metadata}
+        for course_id, embedding, metadata in batch
+    ]
+    if items:
+        _upsert_batch(get_index(), items)
+
 
 def upsert_course_embedding(course_id: str, embedding: list[float], metadata: dict):
-    """Store a course embedding in Pinecone."""
-    index = get_index()
-    index.upsert(vectors=[{"id": course_id, "values": embedding, "metadata": metadata}])
+    """Queue a course embedding for Pinecone.
+
+    Vectors are buffered per thread and sent in batches once
+    UPSERT_BATCH_SIZE accumulate; call flush_embeddings() when done.
+    """
+    buf = getattr(_pending, "items", None)
+    if buf is None:
+        buf = _pending.items = []
+    buf.append((course_id, embedding, metadata))
+    if len(buf) >= UPSERT_BATCH_SIZE:
+        flush_embeddings()
+
+
+def flush_embeddings():
+    """Send any embeddings buffered by upsert_course_embedding on this thread."""
+    buf = getattr(_pending, "items", None)
+    if buf:
+        _pending.items = []
+        upsert_course_embeddings(buf)
 
 
 def search_courses_by_embedding(
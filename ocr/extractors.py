@@ -1,56 +1,73 @@
 """Specialized text extractors for different document formats."""
 from __future__ import annotations
+from contextlib import contextmanager
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Union
 
-
-def extract_pdf_metadata(pdf_bytes: bytes) -> dict:
-    """Extract metadata from a PDF file."""
+if TYPE_CHECKING:
     import fitz
 
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-    metadata = doc.metadata or {}
-    info = {
-        "title": metadata.get("title", ""),
-        "author": metadata.get("author", ""),
-        "subject": metadata.get("subject", ""),
-        "page_count": doc.page_count,
-        "is_encrypted": doc.is_encrypted,
-    }
-    doc.close()
-    return info
+PDFSource = Union[bytes, "fitz.Document"]
 
 
-def extract_tables_from_pdf(pdf_bytes: bytes) -> list[list[list[str]]]:
-    """Extract tables from a PDF using PyMuPDF."""
+@contextmanager
+def opened_pdf(pdf: PDFSource) -> Iterator["fitz.Document"]:
+    """Yield an open PyMuPDF document for raw bytes or an existing handle.
+
+    Pass an already-open document to share one parse across several
+    extractors; it is left open for the caller. Bytes are opened here and
+    closed on exit.
+    """
     import fitz
 
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
+    if isinstance(pdf, (bytes, bytearray, memoryview)):
+        doc = fitz.open(stream=pdf, filetype="pdf")
+        try:
+            yield doc
+        finally:
+            doc.close()
+    else:
+        yield pdf
+
+
+def extract_pdf_metadata(pdf: PDFSource) -> dict:
+    """Extract metadata from a PDF file."""
+    with opened_pdf(pdf) as doc:
+        metadata = doc.metadata or {}
+        return {
+            "title": metadata.get("title", ""),
+            "author": metadata.get("author", ""),
+            "subject": metadata.get("subject", ""),
+            "page_count": doc.page_count,
+            "is_encrypted": doc.is_encrypted,
+        }
+
+
+def extract_tables_from_pdf(pdf: PDFSource) -> list[list[list[str]]]:
+    """Extract tables from a PDF using PyMuPDF."""
     all_tables = []
 
-    for page in doc:
-        tabs = page.find_tables()
-        for tab in tabs:
-            table_data = tab.extract()
-            if table_data:
-                all_tables.append(table_data)
+    with opened_pdf(pdf) as doc:
+        for page in doc:
+            tabs = page.find_tables()
+            for tab in tabs:
+                table_data = tab.extract()
+                if table_data:
+                    all_tables.append(table_data)
 
-    doc.close()
     return all_tables
 
 
-def extract_images_from_pdf(pdf_bytes: bytes) -> list[bytes]:
+def extract_images_from_pdf(pdf: PDFSource) -> list[bytes]:
     """Extract embedded images from a PDF."""
-    import fitz
-
-    doc = fitz.open(stream=pdf_bytes, filetype="pdf")
     images = []
 
-    for page in doc:
-        for img_info in page.get_images(full=True):
-            xref = img_info[0]
-            base_image = doc.extract_image(xref)
-            if base_image:
-                images.append(base_image["image"])
+    with opened_pdf(pdf) as doc:
+        for page in doc:
+            for img_info in page.get_images(full=True):
+                xref = img_info[0]
+                base_image = doc.extract_image(xref)
+                if base_image:
+                    images.append(base_image["image"])
 
-    doc.close()
     return images
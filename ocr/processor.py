@@ -1,7 +1,96 @@
 """OCR processing pipeline using PyMuPDF and EasyOCR."""
 from __future__ import annotations
+import functools
+import queue
+import threading
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterable, Iterator
+
+from ocr.extractors import PDFSource, opened_pdf
+
+# A PDF with more extractable text than this is treated as text-based.
+# If the first _PROBE_PAGES pages hold fewer than _PROBE_MIN_CHARS, the rest
+# aren't scanned for text.
+_MIN_TEXT_CHARS = 50
+_PROBE_PAGES = 3
+_PROBE_MIN_CHARS = 10
+
+# Rasterized pages buffered ahead of OCR; bounds memory held by the producer.
+_PREFETCH_PAGES = 4
+_DONE = object()
+
+# Printed text recognition saturates around 200 dpi; grayscale cuts the
+# bytes per pixel to a third. Pages below the confidence floor (0-1 scale)
+# are re-rendered at full quality.
+_FAST_DPI = 200
+_FULL_DPI = 300
+_RETRY_BELOW_CONFIDENCE = 0.5
+
+# Pages per readtext_batched call / recognizer batch size.
+_OCR_BATCH_SIZE = 8
+
+
+def _pixmap_to_array(pix):
+    """Wrap a PyMuPDF pixmap as an HxWxC uint8 array (no PNG encode/decode)."""
+    import numpy as np
+
+    arr = np.frombuffer(pix.samples, dtype=np.uint8).reshape(pix.height, pix.width, pix.n)
+    if pix.n == 1:
+        arr = arr[:, :, 0]  # grayscale -> HxW
+    elif pix.n == 4:
+        arr = arr[:, :, :3]  # drop alpha
+    return arr
+
+
+def _render_page(page, dpi: int, gray: bool):
+    """Rasterize one page to an image array."""
+    import fitz
+
+    colorspace = fitz.csGRAY if gray else fitz.csRGB
+    return _pixmap_to_array(page.get_pixmap(dpi=dpi, colorspace=colorspace))
+
+
+def _prefetch_page_images(doc, dpi: int, gray: bool = False) -> Iterator:
+    """Yield each page as an image array, rendered on a producer thread.
+
+    Rasterization (MuPDF, C) and OCR inference use different resources, so
+    the next pages render while the caller processes the current one. Only
+    the producer touches ``doc`` until this generator is exhausted/closed.
+    """
+    buf: queue.Queue = queue.Queue(maxsize=_PREFETCH_PAGES)
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for page in doc:
+                if stop.is_set():
+                    return
+                buf.put(_render_page(page, dpi=dpi, gray=gray))
+        except Exception as e:  # re-raised on the consumer side
+            buf.put(e)
+        finally:
+            buf.put(_DONE)
+
+    worker = threading.Thread(target=produce, name="pdf-rasterizer", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = buf.get()
+            if item is _DONE:
+                break
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Unblock and wait for the producer before the caller closes doc
+        stop.set()
+        while worker.is_alive():
+            try:
+                buf.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        worker.join()
 
 
 @dataclass
@@ -20,15 +109,9 @@ class OCRProcessor:
     3. For images: Run EasyOCR directly
     """
 
-    def __init__(self):
-        self._easyocr_reader = None
-
     def _get_easyocr_reader(self):
-        """Lazy-load EasyOCR reader."""
-        if self._easyocr_reader is None:
-            import easyocr
-            self._easyocr_reader = easyocr.Reader(["en"], gpu=False, verbose=False)
-        return self._easyocr_reader
+        """Return the process-wide EasyOCR reader (on GPU when CUDA is available)."""
+        return _get_reader(("en",), gpu=_cuda_available())
 
     def process(self, file_bytes: bytes, filename: str) -> OCRResult:
         """Process a file and extract text.
@@ -48,70 +131,142 @@ class OCRProcessor:
         else:
             raise ValueError(f"Unsupported file format: {ext}")
 
-    def _process_pdf(self, pdf_bytes: bytes) -> OCRResult:
-        """Process a PDF file."""
-        import fitz  # PyMuPDF
-
-        doc = fitz.open(stream=pdf_bytes, filetype="pdf")
-
-        # Step 1: Try text extraction
-        text_parts = []
-        for page in doc:
-            page_text = page.get_text().strip()
-            if page_text:
-                text_parts.append(page_text)
+    def _process_pdf(self, pdf: PDFSource) -> OCRResult:
+        """Process a PDF file (raw bytes or an already-open document)."""
+        with opened_pdf(pdf) as doc:
+            # Step 1: Try text extraction. The first pages usually settle
+            # text-vs-scan, so a near-empty prefix skips straight to OCR.
+            text_parts = []
+            text_chars = 0
+            for page_num, page in enumerate(doc, start=1):
+                page_text = page.get_text().strip()
+                if page_text:
+                    text_parts.append(page_text)
+                    text_chars += len(page_text)
+                if page_num >= _PROBE_PAGES and text_chars < _PROBE_MIN_CHARS:
+                    break
 
-        full_text = "\n\n".join(text_parts)
+            if text_chars > _MIN_TEXT_CHARS:
+                return OCRResult(
+                    text="\n\n".join(text_parts),
+                    confidence=99.0,
+                    method="pymupdf",
+                )
 
-        if len(full_text.strip()) > 50:
-            doc.close()
-            return OCRResult(
-                text=full_text,
-                confidence=99.0,
-                method="pymupdf",
-            )
+            # Step 2: PDF is image-based - convert to images and OCR.
+            # Pages are rasterized on a background thread while EasyOCR
+            # works through the previous ones. First pass is 200 dpi
+            # grayscale; pages that come back weak are redone at 300 dpi RGB.
+            if doc.page_count == 0:
+                return OCRResult(text="", confidence=0.0, method="easyocr")
 
-        # Step 2: PDF is image-based - convert to images and OCR
-        images = []
-        for page in doc:
-            pix = page.get_pixmap(dpi=300)
-            images.append(pix.tobytes("png"))
-        doc.close()
+            # Each page's array is dropped as soon as it is recognized; only
+            # its text and confidence totals are kept.
+            pages = _prefetch_page_images(doc, dpi=_FAST_DPI, gray=True)
+            try:
+                page_results = list(self._ocr_stream(pages))
+            finally:
+                pages.close()
 
-        if not images:
-            return OCRResult(text="", confidence=0.0, method="easyocr")
+            for idx, page in enumerate(page_results):
+                # A page with no text boxes (e.g. blank) has nothing a
+                # sharper render could improve, so only weak hits are redone
+                if page[2] and _page_confidence(page) < _RETRY_BELOW_CONFIDENCE:
+                    retry = self._ocr_page(_render_page(doc[idx], dpi=_FULL_DPI, gray=False))
+                    if _page_confidence(retry) > _page_confidence(page):
+                        page_results[idx] = retry
 
-        return self._ocr_images(images)
+        return _combine_pages(page_results)
 
     def _process_image(self, image_bytes: bytes) -> OCRResult:
         """Process a single image file."""
         return self._ocr_images([image_bytes])
 
-    def _ocr_images(self, image_list: list[bytes]) -> OCRResult:
-        """Run EasyOCR on a list of image bytes."""
+    def _ocr_page(self, image) -> tuple[str, float, int]:
+        """OCR one image; returns its joined text, confidence sum and box count."""
+        results = self._get_easyocr_reader().readtext(image, batch_size=_OCR_BATCH_SIZE)
+        return _page_from_boxes(results)
+
+    def _ocr_stream(self, images: Iterable) -> Iterator[tuple[str, float, int]]:
+        """Lazily OCR images, yielding one page result at a time.
+
+        Runs of same-sized arrays go through the net together; at most one
+        batch of images is held at once.
+        """
         reader = self._get_easyocr_reader()
+        batched = hasattr(reader, "readtext_batched")
+        for batch in _same_shape_batches(images, _OCR_BATCH_SIZE):
+            if batched and len(batch) > 1:
+                results = reader.readtext_batched(batch, batch_size=_OCR_BATCH_SIZE)
+                del batch
+                for r in results:
+                    yield _page_from_boxes(r)
+            else:
+                for image in batch:
+                    yield self._ocr_page(image)
+
+    def _ocr_images(self, image_list: Iterable) -> OCRResult:
+        """Run EasyOCR on an iterable of encoded image bytes or ndarrays."""
+        return _combine_pages(self._ocr_stream(image_list))
+
+
+@functools.lru_cache(maxsize=1)
+def _get_reader(langs: tuple[str, ...] = ("en",), gpu: bool = False):
+    """Load EasyOCR model weights once per process; inference is read-only."""
+    import easyocr
+    return easyocr.Reader(list(langs), gpu=gpu, verbose=False)
+
+
+@functools.lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        return False
+
+
+def _same_shape_batches(images: Iterable, size: int) -> Iterator[list]:
+    """Group consecutive same-shape arrays (readtext_batched needs equal sizes).
+
+    Encoded bytes have no shape and are always yielded alone.
+    """
+    batch: list = []
+    for image in images:
+        shape = getattr(image, "shape", None)
+        if batch and (shape is None or shape != batch[0].shape or len(batch) == size):
+            yield batch
+            batch = []
+        if shape is None:
+            yield [image]
+        else:
+            batch.append(image)
+    if batch:
+        yield batch
+
+
+def _page_from_boxes(results) -> tuple[str, float, int]:
+    text = " ".join(text for (_, text, _) in results)
+    return text, sum(conf for (_, _, conf) in results), len(results)
+
+
+def _page_confidence(page: tuple[str, float, int]) -> float:
+    _, conf_sum, count = page
+    return conf_sum / count if count else 0.0
+
+
+def _combine_pages(page_results: Iterable[tuple[str, float, int]]) -> OCRResult:
+    """Join per-page OCR output into one OCRResult (confidence in percent)."""
+    texts = []
+    conf_sum = 0.0
+    count = 0
+    for text, page_sum, page_count in page_results:
+        texts.append(text)
+        conf_sum += page_sum
+        count += page_count
 
-        all_text = []
-        all_confidences = []
-
-        for img_bytes in image_list:
-            results = reader.readtext(img_bytes)
-            page_texts = []
-            for (bbox, text, conf) in results:
-                page_texts.append(text)
-                all_confidences.append(conf)
-
-            all_text.append(" ".join(page_texts))
-
-        full_text = "\n\n".join(all_text)
-        avg_confidence = (
-            sum(all_confidences) / len(all_confidences) * 100
-            if all_confidences
-            else 0.0
-        )
-
-        return OCRResult(
-            text=full_text,
-            confidence=round(avg_confidence, 1),
-            method="easyocr",
-        )
+    return OCRResult(
+        text="\n\n".join(texts),
+        confidence=round(conf_sum / count * 100, 1) if count else 0.0,
+        method="easyocr",
+    )
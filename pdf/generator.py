@@ -1,11 +1,35 @@
-"""PDF generation orchestrator."""
+"""PDF generation orchestrator.
+
+Templates (and with them ReportLab) are imported inside each generate_*
+function, so importing this module stays cheap for callers that never
+build a PDF. Keep new entry points to the same pattern.
+"""
 from __future__ import annotations
+import functools
+import hashlib
 import json
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # optional speedup; stdlib json accepts bytes too
+    from json import loads as _json_loads
+
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
 
 
+@functools.lru_cache(maxsize=8)
+def _load_sample(filename: str) -> dict:
+    """Parse a sample problems file once per process.
+
+    The returned dict is shared between callers; don't mutate it.
+    """
+    with open(DATA_DIR / "sample_problems" / filename, "rb") as f:
+        return _json_loads(f.read())
+
+
 def generate_practice_pdf_from_sample(subject: str, grade: int) -> bytes | None:
     """Generate a practice problems PDF from sample data files.
 
@@ -24,12 +48,10 @@ def generate_practice_pdf_from_sample(subject: str, grade: int) -> bytes | None:
     if not filename:
         return None
 
-    sample_path = DATA_DIR / "sample_problems" / filename
-    if not sample_path.exists():
+    if not (DATA_DIR / "sample_problems" / filename).exists():
         return None
 
-    with open(sample_path) as f:
-        data = json.load(f)
+    data = _load_sample(filename)
 
     return build_practice_problems_pdf(
         title=data.get("title", f"{subject} Practice Set"),
@@ -40,10 +62,35 @@ def generate_practice_pdf_from_sample(subject: str, grade: int) -> bytes | None:
     )
 
 
+# Rendered course overviews keyed by a hash of the course dict. The output
+# depends only on the course, so an unchanged course returns cached bytes.
+_OVERVIEW_CACHE_SIZE = 128
+_overview_cache: OrderedDict[bytes, bytes] = OrderedDict()
+_overview_lock = threading.Lock()
+
+
+def _course_key(course: dict) -> bytes:
+    payload = json.dumps(course, sort_keys=True, default=str).encode()
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
 def generate_course_overview_pdf(course: dict) -> bytes:
     """Generate a course overview PDF."""
+    key = _course_key(course)
+    with _overview_lock:
+        pdf_bytes = _overview_cache.get(key)
+        if pdf_bytes is not None:
+            _overview_cache.move_to_end(key)
+            return pdf_bytes
+
     from pdf.templates.course_overview import build_course_overview_pdf
-    return build_course_overview_pdf(course)
+    pdf_bytes = build_course_overview_pdf(course)
+
+    with _overview_lock:
+        _overview_cache[key] = pdf_bytes
+        if len(_overview_cache) > _OVERVIEW_CACHE_SIZE:
+            _overview_cache.popitem(last=False)
+    return pdf_bytes
 
 
 def generate_schedule_report_pdf(student_id: str) -> bytes:
@@ -61,6 +108,25 @@ def generate_schedule_report_pdf(student_id: str) -> bytes:
     return build_schedule_report_pdf(student, schedules, slots)
 
 
+async def generate_schedule_reports_bulk(student_ids: list[str]) -> list[bytes]:
+    """Build schedule reports for several students concurrently.
+
+    Each report (DB reads + layout) runs in a worker thread; results are
+    returned in the order of ``student_ids``. Threads share only immutable
+    template state (stylesheet, TableStyles, colors); every flowable is
+    created per build, since layout stores state on the instance.
+    """
+    import asyncio
+    from pdf.styles import get_evlin_styles
+
+    # lru_cache doesn't hold a lock while building, so warm the stylesheet
+    # here rather than letting the first workers each build their own copy
+    get_evlin_styles()
+    return await asyncio.gather(*(
+        asyncio.to_thread(generate_schedule_report_pdf, sid) for sid in student_ids
+    ))
+
+
 def generate_semester_calendar_pdf(
     student_id: str = None,
     num_months: int = 3,
@@ -93,56 +159,56 @@ def generate_semester_calendar_pdf(
     )
 
 
+# Demo data for generate_demo_calendar_pdf (read-only; shared across calls)
+
+# Demo student
+_DEMO_STUDENT = {
+    "first_name": "Emma",
+    "last_name": "Chen",
+    "grade_level": 5,
+    "parent_name": "Linda Chen",
+}
+
+# Demo schedules (mimic DB format)
+_DEMO_SCHEDULES = (
+    {"courses": {"code": "MATH-5A", "title": "Fractions & Decimals", "subject": "Math", "hours_per_week": 3.0}},
+    {"courses": {"code": "ELA-5A", "title": "Grammar & Composition", "subject": "English", "hours_per_week": 3.0}},
+    {"courses": {"code": "SCI-5A", "title": "Earth Science", "subject": "Science", "hours_per_week": 3.0}},
+    {"courses": {"code": "HIST-5A", "title": "US History I", "subject": "History", "hours_per_week": 3.0}},
+    {"courses": {"code": "ART-3A", "title": "Drawing Fundamentals", "subject": "Art", "hours_per_week": 2.0}},
+    {"courses": {"code": "PE-3A", "title": "Movement & Fitness", "subject": "PE", "hours_per_week": 2.0}},
+)
+
+# Demo weekly slots
+_DEMO_SLOTS = (
+    # MATH-5A: Mon/Wed 9:00-10:00
+    {"day_of_week": 0, "start_time": "09:00", "end_time": "10:00", "course_code": "MATH-5A", "course_title": "Fractions & Decimals"},
+    {"day_of_week": 2, "start_time": "09:00", "end_time": "10:00", "course_code": "MATH-5A", "course_title": "Fractions & Decimals"},
+    # ELA-5A: Tue/Thu 9:00-10:00
+    {"day_of_week": 1, "start_time": "09:00", "end_time": "10:00", "course_code": "ELA-5A", "course_title": "Grammar & Composition"},
+    {"day_of_week": 3, "start_time": "09:00", "end_time": "10:00", "course_code": "ELA-5A", "course_title": "Grammar & Composition"},
+    # SCI-5A: Mon/Wed 10:30-11:30
+    {"day_of_week": 0, "start_time": "10:30", "end_time": "11:30", "course_code": "SCI-5A", "course_title": "Earth Science"},
+    {"day_of_week": 2, "start_time": "10:30", "end_time": "11:30", "course_code": "SCI-5A", "course_title": "Earth Science"},
+    # HIST-5A: Tue/Thu 10:30-11:30
+    {"day_of_week": 1, "start_time": "10:30", "end_time": "11:30", "course_code": "HIST-5A", "course_title": "US History I"},
+    {"day_of_week": 3, "start_time": "10:30", "end_time": "11:30", "course_code": "HIST-5A", "course_title": "US History I"},
+    # ART-3A: Fri 9:00-11:00
+    {"day_of_week": 4, "start_time": "09:00", "end_time": "11:00", "course_code": "ART-3A", "course_title": "Drawing Fundamentals"},
+    # PE-3A: Fri 13:00-14:00
+    {"day_of_week": 4, "start_time": "13:00", "end_time": "14:00", "course_code": "PE-3A", "course_title": "Movement & Fitness"},
+)
+
+
 def generate_demo_calendar_pdf(num_months: int = 3) -> bytes:
     """Generate a demo 3-month calendar with sample data. No DB needed."""
     from datetime import date
     from pdf.templates.semester_calendar import build_semester_calendar_pdf
 
-    today = date.today()
-    start = today.replace(day=1)
-
-    # Demo student
-    student = {
-        "first_name": "Emma",
-        "last_name": "Chen",
-        "grade_level": 5,
-        "parent_name": "Linda Chen",
-    }
-
-    # Demo schedules (mimic DB format)
-    demo_schedules = [
-        {"courses": {"code": "MATH-5A", "title": "Fractions & Decimals", "subject": "Math", "hours_per_week": 3.0}},
-        {"courses": {"code": "ELA-5A", "title": "Grammar & Composition", "subject": "English", "hours_per_week": 3.0}},
-        {"courses": {"code": "SCI-5A", "title": "Earth Science", "subject": "Science", "hours_per_week": 3.0}},
-        {"courses": {"code": "HIST-5A", "title": "US History I", "subject": "History", "hours_per_week": 3.0}},
-        {"courses": {"code": "ART-3A", "title": "Drawing Fundamentals", "subject": "Art", "hours_per_week": 2.0}},
-        {"courses": {"code": "PE-3A", "title": "Movement & Fitness", "subject": "PE", "hours_per_week": 2.0}},
-    ]
-
-    # Demo weekly slots
-    demo_slots = [
-        # MATH-5A: Mon/Wed 9:00-10:00
-        {"day_of_week": 0, "start_time": "09:00", "end_time": "10:00", "course_code": "MATH-5A", "course_title": "Fractions & Decimals"},
-        {"day_of_week": 2, "start_time": "09:00", "end_time": "10:00", "course_code": "MATH-5A", "course_title": "Fractions & Decimals"},
-        # ELA-5A: Tue/Thu 9:00-10:00
-        {"day_of_week": 1, "start_time": "09:00", "end_time": "10:00", "course_code": "ELA-5A", "course_title": "Grammar & Composition"},
-        {"day_of_week": 3, "start_time": "09:00", "end_time": "10:00", "course_code": "ELA-5A", "course_title": "Grammar & Composition"},
-        # SCI-5A: Mon/Wed 10:30-11:30
-        {"day_of_week": 0, "start_time": "10:30", "end_time": "11:30", "course_code": "SCI-5A", "course_title": "Earth Science"},
-        {"day_of_week": 2, "start_time": "10:30", "end_time": "11:30", "course_code": "SCI-5A", "course_title": "Earth Science"},
-        # HIST-5A: Tue/Thu 10:30-11:30
-        {"day_of_week": 1, "start_time": "10:30", "end_time": "11:30", "course_code": "HIST-5A", "course_title": "US History I"},
-        {"day_of_week": 3, "start_time": "10:30", "end_time": "11:30", "course_code": "HIST-5A", "course_title": "US History I"},
-        # ART-3A: Fri 9:00-11:00
-        {"day_of_week": 4, "start_time": "09:00", "end_time": "11:00", "course_code": "ART-3A", "course_title": "Drawing Fundamentals"},
-        # PE-3A: Fri 13:00-14:00
-        {"day_of_week": 4, "start_time": "13:00", "end_time": "14:00", "course_code": "PE-3A", "course_title": "Movement & Fitness"},
-    ]
-
     return build_semester_calendar_pdf(
-        student=student,
-        schedules=demo_schedules,
-        slots=demo_slots,
+        student=_DEMO_STUDENT,
+        schedules=_DEMO_SCHEDULES,
+        slots=_DEMO_SLOTS,
         num_months=num_months,
-        start_date=start,
+        start_date=date.today().replace(day=1),
     )
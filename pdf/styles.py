@@ -1,5 +1,6 @@
 """Evlin brand styles for PDF generation."""
 from __future__ import annotations
+import functools
 from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch, cm
 from reportlab.lib.colors import HexColor
@@ -15,6 +16,7 @@ EVLIN_DARK_GRAY = HexColor("#666666")
 EVLIN_TEXT = HexColor("#333333")
 EVLIN_GREEN = HexColor("#27AE60")
 EVLIN_RED = HexColor("#C0392B")
+EVLIN_WHITE = HexColor("#FFFFFF")
 
 # ── Page Dimensions ───────────────────────────────────────
 PAGE_MARGIN = 0.75 * inch
@@ -28,8 +30,13 @@ MONO_FONT = "Courier"
 ITALIC_FONT = "Helvetica-Oblique"
 
 
+@functools.lru_cache(maxsize=1)
 def get_evlin_styles():
-    """Get the full set of Evlin-branded paragraph styles."""
+    """Get the full set of Evlin-branded paragraph styles.
+
+    Built once per process and shared by every template; treat the returned
+    stylesheet as read-only.
+    """
     styles = getSampleStyleSheet()
 
     # Title - main document title
@@ -198,7 +205,7 @@ def get_evlin_styles():
         fontName=HEADING_FONT,
         fontSize=10,
         leading=13,
-        textColor=HexColor("#FFFFFF"),
+        textColor=EVLIN_WHITE,
     ))
 
     return styles
@@ -1,24 +1,36 @@
 """Course overview PDF template."""
 from __future__ import annotations
 from io import BytesIO
-from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, HRFlowable
+from reportlab.platypus import Paragraph, Table, TableStyle, HRFlowable
 from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor
 
 from pdf.styles import (
     get_evlin_styles, EVLIN_NAVY, EVLIN_BLUE, EVLIN_LIGHT_BLUE,
-    EVLIN_ACCENT, EVLIN_GRAY, EVLIN_DARK_GRAY,
+    EVLIN_ACCENT, EVLIN_GRAY, EVLIN_DARK_GRAY, EVLIN_WHITE,
+)
+from pdf.templates.textbook_base import (
+    EvlinTextbookDoc, spacer_med, spacer_lg, spacer_xl, hr_light,
 )
-from pdf.templates.textbook_base import EvlinTextbookDoc
 
+_DETAIL_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (0, -1), EVLIN_LIGHT_BLUE),
+    ("TEXTCOLOR", (0, 0), (0, -1), EVLIN_NAVY),
+    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("PADDING", (0, 0), (-1, -1), 8),
+    ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ("ROWBACKGROUNDS", (1, 0), (1, -1), [EVLIN_WHITE, EVLIN_GRAY]),
+])
 
-def build_course_overview_pdf(course: dict) -> bytes:
+
+def build_course_overview_pdf_stream(course: dict) -> BytesIO:
     """Generate a course overview PDF.
 
     Args:
         course: Course dict with code, title, subject, description, etc.
 
-    Returns: PDF as bytes
+    Returns: BytesIO holding the PDF, positioned at the start
     """
     buffer = BytesIO()
     styles = get_evlin_styles()
@@ -29,14 +41,14 @@ def build_course_overview_pdf(course: dict) -> bytes:
         subtitle=course.get("subject", ""),
     )
 
-    story = []
-
     # Title
-    story.append(Spacer(1, 0.3 * inch))
-    story.append(Paragraph(f"{course['code']}", styles["EvlinSubtitle"]))
-    story.append(Paragraph(course["title"], styles["EvlinTitle"]))
-    story.append(HRFlowable(width="100%", thickness=2, color=EVLIN_BLUE))
-    story.append(Spacer(1, 0.2 * inch))
+    story = [
+        spacer_xl(),
+        Paragraph(f"{course['code']}", styles["EvlinSubtitle"]),
+        Paragraph(course["title"], styles["EvlinTitle"]),
+        HRFlowable(width="100%", thickness=2, color=EVLIN_BLUE),
+        spacer_lg(),
+    ]
 
     # Course details table
     details = [
@@ -53,33 +65,28 @@ def build_course_overview_pdf(course: dict) -> bytes:
         details.append(["Tags", ", ".join(course["tags"])])
 
     detail_table = Table(details, colWidths=[1.8 * inch, 4 * inch])
-    detail_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), EVLIN_LIGHT_BLUE),
-        ("TEXTCOLOR", (0, 0), (0, -1), EVLIN_NAVY),
-        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("PADDING", (0, 0), (-1, -1), 8),
-        ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ("ROWBACKGROUNDS", (1, 0), (1, -1), [HexColor("#FFFFFF"), EVLIN_GRAY]),
-    ]))
+    detail_table.setStyle(_DETAIL_TABLE_STYLE)
     story.append(detail_table)
 
     # Description
-    story.append(Spacer(1, 0.3 * inch))
-    story.append(Paragraph("Course Description", styles["EvlinH2"]))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=EVLIN_LIGHT_BLUE))
-    story.append(Spacer(1, 0.1 * inch))
-    story.append(Paragraph(
-        course.get("description", "No description available."),
-        styles["EvlinBody"],
-    ))
+    story.extend([
+        spacer_xl(),
+        Paragraph("Course Description", styles["EvlinH2"]),
+        hr_light(),
+        spacer_med(),
+        Paragraph(
+            course.get("description", "No description available."),
+            styles["EvlinBody"],
+        ),
+    ])
 
     # Learning objectives (placeholder)
-    story.append(Spacer(1, 0.3 * inch))
-    story.append(Paragraph("Learning Objectives", styles["EvlinH2"]))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=EVLIN_LIGHT_BLUE))
-    story.append(Spacer(1, 0.1 * inch))
+    story.extend([
+        spacer_xl(),
+        Paragraph("Learning Objectives", styles["EvlinH2"]),
+        hr_light(),
+        spacer_med(),
+    ])
 
     objectives = [
         "Develop foundational understanding of core concepts",
@@ -87,9 +94,17 @@ def build_course_overview_pdf(course: dict) -> bytes:
         "Build critical thinking and problem-solving skills",
         "Prepare for the next level of study in this subject",
     ]
-    for i, obj in enumerate(objectives, 1):
-        story.append(Paragraph(f"{i}. {obj}", styles["EvlinBody"]))
+    story.extend(
+        Paragraph(f"{i}. {obj}", styles["EvlinBody"])
+        for i, obj in enumerate(objectives, 1)
+    )
 
     # Build
     doc.build(story)
-    return buffer.getvalue()
+    buffer.seek(0)
+    return buffer
+
+
+def build_course_overview_pdf(course: dict) -> bytes:
+    """Same as build_course_overview_pdf_stream, returned as bytes."""
+    return build_course_overview_pdf_stream(course).getvalue()
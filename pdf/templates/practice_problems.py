@@ -1,5 +1,6 @@
 """Practice problems PDF template - textbook quality layout."""
 from __future__ import annotations
+import functools
 from io import BytesIO
 from reportlab.platypus import (
     Paragraph, Spacer, PageBreak, HRFlowable, Table, TableStyle,
@@ -11,16 +12,42 @@ from pdf.styles import (
     get_evlin_styles, EVLIN_NAVY, EVLIN_BLUE, EVLIN_LIGHT_BLUE,
     EVLIN_ACCENT, EVLIN_GRAY, EVLIN_GREEN, EVLIN_DARK_GRAY,
 )
-from pdf.templates.textbook_base import EvlinTextbookDoc
+from pdf.templates.textbook_base import (
+    EvlinTextbookDoc, spacer_small, spacer_med, spacer_lg, spacer_xl,
+)
 
 
-def build_practice_problems_pdf(
+_TRUE_FALSE_HTML = "&nbsp;&nbsp;&nbsp;&nbsp;☐ True&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;☐ False"
+_SHORT_ANSWER_HTML = "Answer: _____________________________________________"
+
+
+def _essay_rule() -> HRFlowable:
+    return HRFlowable(width="90%", thickness=0.3, color=EVLIN_LIGHT_BLUE, spaceAfter=8)
+
+
+_INFO_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (0, -1), EVLIN_LIGHT_BLUE),
+    ("TEXTCOLOR", (0, 0), (0, -1), EVLIN_NAVY),
+    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("PADDING", (0, 0), (-1, -1), 6),
+    ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+])
+
+
+@functools.lru_cache(maxsize=32)
+def _points_label(points) -> str:
+    return f"[{points} point{'s' if points != 1 else ''}]"
+
+
+def build_practice_problems_pdf_stream(
     title: str,
     subject: str,
     grade: int,
     problems: list[dict],
     include_answers: bool = True,
-) -> bytes:
+) -> BytesIO:
     """Generate a textbook-quality practice problems PDF.
 
     Args:
@@ -31,7 +58,7 @@ def build_practice_problems_pdf(
             number, instruction, content, type, points, answer, explanation
         include_answers: Whether to include answer key section
 
-    Returns: PDF as bytes
+    Returns: BytesIO holding the PDF, positioned at the start
     """
     buffer = BytesIO()
     styles = get_evlin_styles()
@@ -42,65 +69,54 @@ def build_practice_problems_pdf(
         subtitle=f"{subject} | Grade {grade}",
     )
 
-    story = []
-
     # ── Cover Section ─────────────────────────────────────
-    story.append(Spacer(1, 0.3 * inch))
-    story.append(Paragraph(title, styles["EvlinTitle"]))
-    story.append(Paragraph(f"{subject} — Grade {grade}", styles["EvlinSubtitle"]))
-
-    # Info box
-    total_points = sum(p.get("points", 0) for p in problems)
-    info_data = [
-        ["Total Questions", str(len(problems))],
-        ["Total Points", str(total_points)],
-        ["Subject", subject],
-        ["Grade Level", str(grade)],
+    story = [
+        spacer_xl(),
+        Paragraph(title, styles["EvlinTitle"]),
+        Paragraph(f"{subject} — Grade {grade}", styles["EvlinSubtitle"]),
+        # Info box - filled in after the problems loop, which totals the points
+        spacer_lg(),
+        None,
     ]
-    info_table = Table(info_data, colWidths=[1.5 * inch, 2 * inch])
-    info_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), EVLIN_LIGHT_BLUE),
-        ("TEXTCOLOR", (0, 0), (0, -1), EVLIN_NAVY),
-        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("PADDING", (0, 0), (-1, -1), 6),
-        ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
-        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-    ]))
-    story.append(Spacer(1, 0.2 * inch))
-    story.append(info_table)
-
-    # Name/Date line
-    story.append(Spacer(1, 0.3 * inch))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=EVLIN_DARK_GRAY))
-    story.append(Spacer(1, 0.05 * inch))
-    story.append(Paragraph(
-        "Name: ________________________________    Date: ________________",
-        styles["EvlinBody"],
-    ))
-    story.append(Spacer(1, 0.2 * inch))
-    story.append(HRFlowable(width="100%", thickness=1, color=EVLIN_BLUE))
-
-    # ── Problems Section ──────────────────────────────────
-    story.append(Spacer(1, 0.2 * inch))
-    story.append(Paragraph("Problems", styles["EvlinH2"]))
-
+    info_idx = len(story) - 1
+
+    story.extend([
+        # Name/Date line
+        spacer_xl(),
+        HRFlowable(width="100%", thickness=0.5, color=EVLIN_DARK_GRAY),
+        spacer_small(),
+        Paragraph(
+            "Name: ________________________________    Date: ________________",
+            styles["EvlinBody"],
+        ),
+        spacer_lg(),
+        HRFlowable(width="100%", thickness=1, color=EVLIN_BLUE),
+        # ── Problems Section ──────────────────────────────
+        spacer_lg(),
+        Paragraph("Problems", styles["EvlinH2"]),
+    ])
+
+    # Answer-space lines have fixed markup, but each placement needs its own
+    # Paragraph (layout state lives on the instance)
+    answer_style = styles["ProblemInstruction"]
+
+    total_points = 0
+    answer_key = []  # (num, points, answer, explanation) for the key section
     for p in problems:
-        num = p.get("number", "?")
-        instruction = p.get("instruction", "")
-        content = p.get("content", "")
-        points = p.get("points", 0)
-        prob_type = p.get("type", "short_answer")
+        get = p.get
+        num, points = get("number", "?"), get("points", 0)
+        instruction, content = get("instruction", ""), get("content", "")
+        prob_type = get("type", "short_answer")
+        total_points += points
+        if include_answers:
+            answer_key.append((num, points, get("answer", ""), get("explanation", "")))
 
         # Problem number + points
         story.append(Paragraph(
             f"<b>Problem {num}</b>",
             styles["ProblemNumber"],
         ))
-        story.append(Paragraph(
-            f"[{points} point{'s' if points != 1 else ''}]",
-            styles["PointsLabel"],
-        ))
+        story.append(Paragraph(_points_label(points), styles["PointsLabel"]))
 
         # Instruction
         if instruction:
@@ -117,26 +133,27 @@ def build_practice_problems_pdf(
         if prob_type == "essay":
             # Large answer box
             for _ in range(6):
-                story.append(Spacer(1, 0.05 * inch))
-                story.append(HRFlowable(
-                    width="90%", thickness=0.3, color=EVLIN_LIGHT_BLUE,
-                    spaceAfter=8,
-                ))
+                story.append(spacer_small())
+                story.append(_essay_rule())
         elif prob_type == "true_false":
-            story.append(Spacer(1, 0.05 * inch))
-            story.append(Paragraph(
-                "&nbsp;&nbsp;&nbsp;&nbsp;☐ True&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;☐ False",
-                styles["ProblemInstruction"],
-            ))
+            story.append(spacer_small())
+            story.append(Paragraph(_TRUE_FALSE_HTML, answer_style))
         else:
             # Short answer line
-            story.append(Spacer(1, 0.1 * inch))
-            story.append(Paragraph(
-                "Answer: _____________________________________________",
-                styles["ProblemInstruction"],
-            ))
+            story.append(spacer_med())
+            story.append(Paragraph(_SHORT_ANSWER_HTML, answer_style))
+
+        story.append(spacer_med())
 
-        story.append(Spacer(1, 0.1 * inch))
+    info_data = [
+        ["Total Questions", str(len(problems))],
+        ["Total Points", str(total_points)],
+        ["Subject", subject],
+        ["Grade Level", str(grade)],
+    ]
+    info_table = Table(info_data, colWidths=[1.5 * inch, 2 * inch])
+    info_table.setStyle(_INFO_TABLE_STYLE)
+    story[info_idx] = info_table
 
     # ── Answer Key Section ────────────────────────────────
     if include_answers:
@@ -145,12 +162,7 @@ def build_practice_problems_pdf(
         story.append(HRFlowable(width="100%", thickness=1, color=EVLIN_GREEN))
         story.append(Spacer(1, 0.15 * inch))
 
-        for p in problems:
-            num = p.get("number", "?")
-            answer = p.get("answer", "")
-            explanation = p.get("explanation", "")
-            points = p.get("points", 0)
-
+        for num, points, answer, explanation in answer_key:
             # Answer with green accent
             story.append(Paragraph(
                 f"<b>Problem {num}</b> [{points} pts]",
@@ -168,4 +180,18 @@ def build_practice_problems_pdf(
 
     # Build
     doc.build(story)
-    return buffer.getvalue()
+    buffer.seek(0)
+    return buffer
+
+
+def build_practice_problems_pdf(
+    title: str,
+    subject: str,
+    grade: int,
+    problems: list[dict],
+    include_answers: bool = True,
+) -> bytes:
+    """Same as build_practice_problems_pdf_stream, returned as bytes."""
+    return build_practice_problems_pdf_stream(
+        title, subject, grade, problems, include_answers=include_answers,
+    ).getvalue()
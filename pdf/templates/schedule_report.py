@@ -1,30 +1,55 @@
 """Schedule report PDF template."""
 from __future__ import annotations
+from collections import defaultdict
 from io import BytesIO
+from operator import itemgetter
+from types import MappingProxyType
 from datetime import date
-from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, HRFlowable
+from reportlab.platypus import Paragraph, Table, TableStyle, HRFlowable
 from reportlab.lib.units import inch
 from reportlab.lib.colors import HexColor
 
 from pdf.styles import (
     get_evlin_styles, EVLIN_NAVY, EVLIN_BLUE, EVLIN_LIGHT_BLUE,
-    EVLIN_GRAY, EVLIN_DARK_GRAY, EVLIN_GREEN, EVLIN_ACCENT,
+    EVLIN_GRAY, EVLIN_DARK_GRAY, EVLIN_GREEN, EVLIN_ACCENT, EVLIN_WHITE,
+)
+from pdf.templates.textbook_base import (
+    EvlinTextbookDoc, spacer_med, spacer_lg, spacer_xl, hr_light,
 )
-from pdf.templates.textbook_base import EvlinTextbookDoc
 
-DAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
 
-SUBJECT_COLORS = {
+SUBJECT_COLORS = MappingProxyType({
     "Math": HexColor("#4A90D9"),
     "Science": HexColor("#27AE60"),
     "English": HexColor("#E67E22"),
     "History": HexColor("#8E44AD"),
     "Art": HexColor("#E74C3C"),
     "PE": HexColor("#16A085"),
-}
-
-
-def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[dict]) -> bytes:
+})
+
+_INFO_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (0, -1), EVLIN_LIGHT_BLUE),
+    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 10),
+    ("PADDING", (0, 0), (-1, -1), 6),
+    ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
+])
+
+# Navy header row + zebra body; shared by the course and weekly tables
+_LISTING_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), EVLIN_NAVY),
+    ("TEXTCOLOR", (0, 0), (-1, 0), EVLIN_WHITE),
+    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ("PADDING", (0, 0), (-1, -1), 6),
+    ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [EVLIN_WHITE, EVLIN_GRAY]),
+    ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+])
+
+
+def build_schedule_report_pdf_stream(student: dict, schedules: list[dict], slots: list[dict]) -> BytesIO:
     """Generate a student schedule report PDF.
 
     Args:
@@ -32,7 +57,7 @@ def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[
         schedules: Active schedules with course info
         slots: All schedule slots with course info
 
-    Returns: PDF as bytes
+    Returns: BytesIO holding the PDF, positioned at the start
     """
     buffer = BytesIO()
     styles = get_evlin_styles()
@@ -48,7 +73,7 @@ def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[
     story = []
 
     # Title section
-    story.append(Spacer(1, 0.3 * inch))
+    story.append(spacer_xl())
     story.append(Paragraph("Student Schedule Report", styles["EvlinTitle"]))
     story.append(Paragraph(
         f"{student_name} — Grade {student['grade_level']}",
@@ -57,7 +82,7 @@ def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[
     story.append(HRFlowable(width="100%", thickness=2, color=EVLIN_BLUE))
 
     # Student info
-    story.append(Spacer(1, 0.2 * inch))
+    story.append(spacer_lg())
     info_items = [
         ["Student", student_name],
         ["Grade", str(student["grade_level"])],
@@ -67,25 +92,29 @@ def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[
         info_items.append(["Parent/Guardian", student["parent_name"]])
 
     info_table = Table(info_items, colWidths=[1.5 * inch, 4 * inch])
-    info_table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (0, -1), EVLIN_LIGHT_BLUE),
-        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-        ("FONTSIZE", (0, 0), (-1, -1), 10),
-        ("PADDING", (0, 0), (-1, -1), 6),
-        ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
-    ]))
+    info_table.setStyle(_INFO_TABLE_STYLE)
     story.append(info_table)
 
+    # Nothing on file: one line instead of two empty sections
+    if not schedules and not slots:
+        story.append(spacer_xl())
+        story.append(Paragraph("No enrollments or schedule on file.", styles["EvlinBody"]))
+        doc.build(story)
+        buffer.seek(0)
+        return buffer
+
     # Course summary
-    story.append(Spacer(1, 0.3 * inch))
+    story.append(spacer_xl())
     story.append(Paragraph("Enrolled Courses", styles["EvlinH2"]))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=EVLIN_LIGHT_BLUE))
-    story.append(Spacer(1, 0.1 * inch))
+    story.append(hr_light())
+    story.append(spacer_med())
 
     if schedules:
         course_data = [["Code", "Course Title", "Subject", "Hrs/Wk", "Status"]]
+        total_hours = 0
         for sch in schedules:
             course = sch.get("courses", {})
+            total_hours += course.get("hours_per_week", 0)
             course_data.append([
                 course.get("code", ""),
                 course.get("title", ""),
@@ -98,22 +127,10 @@ def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[
             course_data,
             colWidths=[1 * inch, 2.5 * inch, 1 * inch, 0.8 * inch, 0.8 * inch],
         )
-        course_table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), EVLIN_NAVY),
-            ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#FFFFFF")),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("PADDING", (0, 0), (-1, -1), 6),
-            ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#FFFFFF"), EVLIN_GRAY]),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ]))
+        course_table.setStyle(_LISTING_TABLE_STYLE)
         story.append(course_table)
 
-        total_hours = sum(
-            s.get("courses", {}).get("hours_per_week", 0) for s in schedules
-        )
-        story.append(Spacer(1, 0.1 * inch))
+        story.append(spacer_med())
         story.append(Paragraph(
             f"<b>Total Weekly Hours: {total_hours:.1f}</b>",
             styles["EvlinBody"],
@@ -122,48 +139,45 @@ def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[
         story.append(Paragraph("No active courses enrolled.", styles["EvlinBody"]))
 
     # Weekly schedule grid
-    story.append(Spacer(1, 0.3 * inch))
+    story.append(spacer_xl())
     story.append(Paragraph("Weekly Schedule", styles["EvlinH2"]))
-    story.append(HRFlowable(width="100%", thickness=0.5, color=EVLIN_LIGHT_BLUE))
-    story.append(Spacer(1, 0.1 * inch))
+    story.append(hr_light())
+    story.append(spacer_med())
 
     if slots:
-        # Organize slots by day
-        slots_by_day = {}
+        # Organize slots by day as (sort_key, table_row), formatting each
+        # slot's cells once here
+        rows_by_day = defaultdict(list)
         for s in slots:
-            d = s.get("day_of_week", 0)
-            if d not in slots_by_day:
-                slots_by_day[d] = []
-            slots_by_day[d].append(s)
+            day_idx = s.get("day_of_week", 0)
+            start = s.get("start_time") or ""
+            rows_by_day[day_idx].append((start, [
+                DAY_NAMES[day_idx],
+                f"{str(start)[:5]} - {str(s.get('end_time', ''))[:5]}",
+                f"{s.get('course_code', '')} {s.get('course_title', '')}",
+                s.get("location", "Home"),
+            ]))
 
         sched_data = [["Day", "Time", "Course", "Location"]]
-        for day_idx in sorted(slots_by_day.keys()):
-            day_slots = sorted(slots_by_day[day_idx], key=lambda x: str(x.get("start_time", "")))
-            for s in day_slots:
-                sched_data.append([
-                    DAY_NAMES[day_idx],
-                    f"{str(s.get('start_time', ''))[:5]} - {str(s.get('end_time', ''))[:5]}",
-                    f"{s.get('course_code', '')} {s.get('course_title', '')}",
-                    s.get("location", "Home"),
-                ])
+        for day_idx in sorted(rows_by_day):
+            day_rows = rows_by_day[day_idx]
+            day_rows.sort(key=itemgetter(0))
+            sched_data.extend(row for _, row in day_rows)
 
         sched_table = Table(
             sched_data,
             colWidths=[1.2 * inch, 1.2 * inch, 2.8 * inch, 1 * inch],
         )
-        sched_table.setStyle(TableStyle([
-            ("BACKGROUND", (0, 0), (-1, 0), EVLIN_NAVY),
-            ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#FFFFFF")),
-            ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-            ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ("PADDING", (0, 0), (-1, -1), 6),
-            ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#FFFFFF"), EVLIN_GRAY]),
-            ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-        ]))
+        sched_table.setStyle(_LISTING_TABLE_STYLE)
         story.append(sched_table)
     else:
         story.append(Paragraph("No scheduled time slots.", styles["EvlinBody"]))
 
     doc.build(story)
-    return buffer.getvalue()
+    buffer.seek(0)
+    return buffer
+
+
+def build_schedule_report_pdf(student: dict, schedules: list[dict], slots: list[dict]) -> bytes:
+    """Same as build_schedule_report_pdf_stream, returned as bytes."""
+    return build_schedule_report_pdf_stream(student, schedules, slots).getvalue()
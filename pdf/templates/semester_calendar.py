@@ -6,6 +6,7 @@ Each day cell shows the courses scheduled on that day with times.
 from __future__ import annotations
 import calendar
 from io import BytesIO
+from typing import BinaryIO
 from datetime import date, timedelta
 from reportlab.platypus import Paragraph, Spacer, Table, TableStyle, HRFlowable, PageBreak
 from reportlab.lib.pagesizes import letter, landscape
@@ -15,13 +16,16 @@ from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
 
 from pdf.styles import (
     get_evlin_styles, EVLIN_NAVY, EVLIN_BLUE, EVLIN_LIGHT_BLUE,
-    EVLIN_GRAY, EVLIN_DARK_GRAY, EVLIN_ACCENT, EVLIN_TEXT,
+    EVLIN_GRAY, EVLIN_DARK_GRAY, EVLIN_ACCENT, EVLIN_TEXT, EVLIN_WHITE,
     HEADING_FONT, BODY_FONT, ITALIC_FONT, PAGE_MARGIN,
 )
 
 PAGE_WIDTH, PAGE_HEIGHT = landscape(letter)
 
 DAY_HEADERS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+_DAY_HEADER_HTML = tuple(
+    f'<font name="{HEADING_FONT}" size="9" color="#FFFFFF">{dh}</font>' for dh in DAY_HEADERS
+)
 
 SUBJECT_COLORS = {
     "Math":    ("#4A90D9", "#EAF1FA"),
@@ -32,6 +36,23 @@ SUBJECT_COLORS = {
     "PE":      ("#16A085", "#E8F6F3"),
 }
 
+# Opening markup of a day-cell course line, per subject color
+_COURSE_LINE_PREFIX = {
+    subj: f'<br/><font name="{BODY_FONT}" size="6" color="{fg}">'
+    for subj, (fg, _) in SUBJECT_COLORS.items()
+}
+_DEFAULT_FG = "#333333"
+_COURSE_LINE_PREFIX_DEFAULT = f'<br/><font name="{BODY_FONT}" size="6" color="{_DEFAULT_FG}">'
+
+# Day cell shading
+_WEEKEND_BG = HexColor("#F8F8F8")
+_OUTSIDE_BG = HexColor("#F0F0F0")
+
+# Palette hex digits (no "#") for inline <font color=...> markup
+_NAVY_HEX = EVLIN_NAVY.hexval()[2:]
+_DARK_GRAY_HEX = EVLIN_DARK_GRAY.hexval()[2:]
+_ACCENT_HEX = EVLIN_ACCENT.hexval()[2:]
+
 
 class _CalendarDoc(BaseDocTemplate):
     """Landscape document for calendar pages."""
@@ -41,6 +62,12 @@ class _CalendarDoc(BaseDocTemplate):
         self.doc_subtitle = subtitle
         margin = 0.5 * inch
 
+        # Fixed per-page header/footer geometry, computed once
+        self._header_y = PAGE_HEIGHT - margin
+        self._footer_y = margin - 0.08 * inch
+        self._header_rect = (margin, self._header_y - 2, PAGE_WIDTH - 2 * margin, 22)
+        self._title_text = title[:80]
+
         super().__init__(
             filename,
             pagesize=landscape(letter),
@@ -63,14 +90,14 @@ class _CalendarDoc(BaseDocTemplate):
         margin = 0.5 * inch
 
         # Header bar
-        header_y = PAGE_HEIGHT - margin
+        header_y = self._header_y
         canvas.setFillColor(EVLIN_NAVY)
-        canvas.rect(margin, header_y - 2, PAGE_WIDTH - 2 * margin, 22, fill=1, stroke=0)
-        canvas.setFillColor(HexColor("#FFFFFF"))
+        canvas.rect(*self._header_rect, fill=1, stroke=0)
+        canvas.setFillColor(EVLIN_WHITE)
         canvas.setFont(HEADING_FONT, 9)
         canvas.drawString(margin + 6, header_y + 2, "EVLIN EDUCATION")
         canvas.setFont(BODY_FONT, 8)
-        canvas.drawRightString(PAGE_WIDTH - margin - 6, header_y + 2, self.doc_title[:80])
+        canvas.drawRightString(PAGE_WIDTH - margin - 6, header_y + 2, self._title_text)
 
         # Accent line
         canvas.setStrokeColor(EVLIN_BLUE)
@@ -78,7 +105,7 @@ class _CalendarDoc(BaseDocTemplate):
         canvas.line(margin, header_y - 4, PAGE_WIDTH - margin, header_y - 4)
 
         # Footer
-        footer_y = margin - 0.08 * inch
+        footer_y = self._footer_y
         canvas.setStrokeColor(EVLIN_LIGHT_BLUE)
         canvas.setLineWidth(0.5)
         canvas.line(margin, footer_y + 10, PAGE_WIDTH - margin, footer_y + 10)
@@ -92,12 +119,83 @@ class _CalendarDoc(BaseDocTemplate):
         canvas.restoreState()
 
 
+def _first_of_month(d: date, months_ahead: int = 0) -> date:
+    """First day of the month ``months_ahead`` months after ``d``'s month."""
+    y, m = divmod(d.year * 12 + d.month - 1 + months_ahead, 12)
+    return date(y, m + 1, 1)
+
+
+def _month_weeks(year: int, month: int) -> list[list[int]]:
+    """Day numbers laid out as 6 Monday-first weeks; 0 = outside the month."""
+    first_weekday, days_in_month = calendar.monthrange(year, month)
+    weeks = [[0] * 7 for _ in range(6)]
+    for idx in range(first_weekday, first_weekday + days_in_month):
+        weeks[idx // 7][idx % 7] = idx - first_weekday + 1
+    return weeks
+
+
+def _slot_rows(slots: list[dict]) -> list[tuple]:
+    """Reduce each slot to (course_code, day_of_week, "HH:MM", subject).
+
+    Done once per calendar so the time string is sliced a single time per
+    slot rather than on every day cell and legend row. Rows come back sorted
+    by code, day and time; the caller's dicts are left untouched.
+    """
+    return sorted(
+        (s.get("course_code", ""), s.get("day_of_week", 0),
+         str(s.get("start_time", ""))[:5], s.get("subject", ""))
+        for s in slots
+    )
+
+
+def _course_info_by_code(schedules: list[dict]) -> dict[str, tuple]:
+    """Map course code -> (title, subject, hours_per_week, subject fg color)."""
+    info = {}
+    for sch in schedules:
+        c = sch.get("courses", {})
+        subj = c.get("subject", "")
+        fg = SUBJECT_COLORS[subj][0] if subj in SUBJECT_COLORS else _DEFAULT_FG
+        info[c.get("code", "")] = (
+            c.get("title", ""), subj, str(c.get("hours_per_week", "")), fg,
+        )
+    return info
+
+
+def _index_slots(slot_rows: list[tuple], course_info: dict[str, tuple]) -> dict:
+    """Group slot rows by day of week.
+
+    Built once per calendar and shared by every month page. Each day holds
+    (time_str, course_code, subject) tuples sorted by start time; the
+    subject comes from the enrolled course when known, else the slot.
+    """
+    # day_of_week: 0=Monday (matching Python calendar and our DB)
+    slot_by_dow = {}
+    for code, dow, time_str, subj in slot_rows:
+        info = course_info.get(code)
+        if info is not None:
+            subj = info[1]
+        slot_by_dow.setdefault(dow, []).append((time_str, code, subj))
+    for day_slots in slot_by_dow.values():
+        day_slots.sort()
+    return slot_by_dow
+
+
+def _day_number_html(day_num: int, is_outside: bool, is_today: bool) -> str:
+    """Day number markup (underlined in accent color if it's today)."""
+    if is_today:
+        return (f'<font name="{HEADING_FONT}" size="9" color="#{_ACCENT_HEX}">'
+                f'<u>{day_num}</u></font>')
+    day_color = _DARK_GRAY_HEX if is_outside else _NAVY_HEX
+    return f'<font name="{HEADING_FONT}" size="9" color="#{day_color}">{day_num}</font>'
+
+
 def _build_month_page(
     year: int,
     month: int,
-    slots: list[dict],
-    schedules: list[dict],
+    slot_by_dow: dict[int, list[tuple]],
     styles,
+    header_row: list,
+    day_cells: dict,
     start_date: date = None,
     end_date: date = None,
 ) -> list:
@@ -105,116 +203,89 @@ def _build_month_page(
 
     Args:
         year, month: Which month to render
-        slots: All weekly schedule slots with course info
-        schedules: Schedule records with course metadata
+        slot_by_dow: Weekly slots grouped by day of week (see _index_slots)
         styles: ReportLab paragraph styles
+        header_row: Day-name header cells, shared by every month (static)
+        day_cells: Pool of day-number-only cells, shared by every month
         start_date: Optional semester start (greys out days before)
         end_date: Optional semester end (greys out days after)
 
     Returns: list of flowables
     """
     month_name = calendar.month_name[month]
+    # Day comparisons below are plain int compares on ordinals
+    today_ord = date.today().toordinal()
+    start_ord = start_date.toordinal() if start_date else None
+    end_ord = end_date.toordinal() if end_date else None
+    day0_ord = date(year, month, 1).toordinal() - 1  # + day_num -> that day
     story = []
 
     # Month title
     story.append(Paragraph(
-        f'<font size="20" color="#{EVLIN_NAVY.hexval()[2:]}">{month_name} {year}</font>',
+        f'<font size="20" color="#{_NAVY_HEX}">{month_name} {year}</font>',
         styles["EvlinTitle"],
     ))
     story.append(Spacer(1, 0.1 * inch))
 
-    # Build lookup: day_of_week -> list of course entries
-    # day_of_week: 0=Monday (matching Python calendar and our DB)
-    slot_by_dow = {}
-    for s in slots:
-        dow = s.get("day_of_week", 0)
-        if dow not in slot_by_dow:
-            slot_by_dow[dow] = []
-        slot_by_dow[dow].append(s)
-
-    # Build course subject lookup
-    course_subjects = {}
-    for sch in schedules:
-        c = sch.get("courses", {})
-        code = c.get("code", "")
-        course_subjects[code] = c.get("subject", "")
-
-    # Get calendar matrix (weeks as rows, 0=Monday)
-    cal = calendar.Calendar(firstweekday=0)
-    month_weeks = cal.monthdayscalendar(year, month)
-
-    # Ensure exactly 6 rows for consistent layout
-    while len(month_weeks) < 6:
-        month_weeks.append([0] * 7)
+    # Calendar matrix (6 weeks as rows, 0=Monday)
+    month_weeks = _month_weeks(year, month)
 
     # Column widths for 7-day grid: landscape letter is 11" wide, ~0.5" margin each side = 10" usable
     col_w = (PAGE_WIDTH - 1.0 * inch) / 7.0
 
-    # Build header row
-    header_row = []
-    for dh in DAY_HEADERS:
-        header_row.append(Paragraph(
-            f'<font name="{HEADING_FONT}" size="9" color="#FFFFFF">{dh}</font>',
-            styles["Normal"],
-        ))
-
     # Build data rows
     data_rows = [header_row]
-    cell_styles = []  # extra style commands
+    # Shaded cells, collected as ranges so each becomes one style command:
+    # weekend column -> [first_row, last_row] of in-month days, and
+    # per-row runs of consecutive outside-range days.
+    weekend_rows: dict[int, list[int]] = {}
+    outside_runs: list[tuple[int, int, int]] = []  # (row, first_col, last_col)
 
     for week_idx, week in enumerate(month_weeks):
         row = []
+        row_in_table = week_idx + 1  # +1 for header row
         for day_idx, day_num in enumerate(week):
             if day_num == 0:
                 # Empty cell (not in this month)
                 row.append("")
                 continue
 
-            this_date = date(year, month, day_num)
-            is_outside = False
-            if start_date and this_date < start_date:
-                is_outside = True
-            if end_date and this_date > end_date:
-                is_outside = True
-
-            # Day number
-            day_color = EVLIN_DARK_GRAY.hexval()[2:] if is_outside else EVLIN_NAVY.hexval()[2:]
-            cell_content = f'<font name="{HEADING_FONT}" size="9" color="#{day_color}">{day_num}</font>'
-
-            # Check if it's today
-            if this_date == date.today():
-                cell_content = (
-                    f'<font name="{HEADING_FONT}" size="9" color="#{EVLIN_ACCENT.hexval()[2:]}">'
-                    f'<u>{day_num}</u></font>'
-                )
-
-            # Add courses for this day of week (only within semester range)
-            if not is_outside and day_idx in slot_by_dow:
-                for s in slot_by_dow[day_idx]:
-                    code = s.get("course_code", "")
-                    subj = course_subjects.get(code, s.get("subject", ""))
-                    fg, bg = SUBJECT_COLORS.get(subj, ("#333333", "#F0F0F0"))
-                    time_str = f"{str(s.get('start_time', ''))[:5]}"
-                    cell_content += (
-                        f'<br/><font name="{BODY_FONT}" size="6" color="{fg}">'
-                        f'{code} {time_str}</font>'
+            this_ord = day0_ord + day_num
+            is_outside = (
+                (start_ord is not None and this_ord < start_ord)
+                or (end_ord is not None and this_ord > end_ord)
+            )
+            is_today = this_ord == today_ord
+            day_slots = None if is_outside else slot_by_dow.get(day_idx)
+
+            if day_slots:
+                # Day number plus one line per course (only within semester range)
+                parts = [_day_number_html(day_num, is_outside, is_today)]
+                for time_str, code, subj in day_slots:
+                    prefix = _COURSE_LINE_PREFIX.get(subj, _COURSE_LINE_PREFIX_DEFAULT)
+                    parts.append(prefix + code + " " + time_str + "</font>")
+                cell = Paragraph("".join(parts), styles["Normal"])
+            else:
+                # Day-number-only cells come from a small closed set; reuse them
+                key = (day_num, is_outside, is_today)
+                cell = day_cells.get(key)
+                if cell is None:
+                    cell = day_cells[key] = Paragraph(
+                        _day_number_html(day_num, is_outside, is_today), styles["Normal"],
                     )
 
-            # Weekend shading (Sat=5, Sun=6)
-            row_in_table = week_idx + 1  # +1 for header row
+            # Weekend shading (Sat=5, Sun=6); in-month days of a column are
+            # consecutive rows
             if day_idx >= 5:
-                cell_styles.append(
-                    ("BACKGROUND", (day_idx, row_in_table), (day_idx, row_in_table),
-                     HexColor("#F8F8F8"))
-                )
+                weekend_rows.setdefault(day_idx, [row_in_table, row_in_table])[1] = row_in_table
 
             if is_outside:
-                cell_styles.append(
-                    ("BACKGROUND", (day_idx, row_in_table), (day_idx, row_in_table),
-                     HexColor("#F0F0F0"))
-                )
+                if outside_runs and outside_runs[-1][0] == row_in_table and outside_runs[-1][2] == day_idx - 1:
+                    outside_runs[-1] = (row_in_table, outside_runs[-1][1], day_idx)
+                else:
+                    outside_runs.append((row_in_table, day_idx, day_idx))
 
-            row.append(Paragraph(cell_content, styles["Normal"]))
+            row.append(cell)
         data_rows.append(row)
 
     # Row height: divide available space evenly for 6 weeks + header
@@ -231,7 +302,7 @@ def _build_month_page(
     style_commands = [
         # Header row
         ("BACKGROUND", (0, 0), (-1, 0), EVLIN_NAVY),
-        ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#FFFFFF")),
+        ("TEXTCOLOR", (0, 0), (-1, 0), EVLIN_WHITE),
         ("ALIGN", (0, 0), (-1, 0), "CENTER"),
         ("VALIGN", (0, 0), (-1, 0), "MIDDLE"),
         # All cells
@@ -242,7 +313,15 @@ def _build_month_page(
         ("TOPPADDING", (0, 1), (-1, -1), 3),
         ("BOTTOMPADDING", (0, 1), (-1, -1), 3),
     ]
-    style_commands.extend(cell_styles)
+    # Outside-range shading is applied after (and so wins over) weekend shading
+    style_commands.extend(
+        ("BACKGROUND", (col, first), (col, last), _WEEKEND_BG)
+        for col, (first, last) in weekend_rows.items()
+    )
+    style_commands.extend(
+        ("BACKGROUND", (c1, r), (c2, r), _OUTSIDE_BG)
+        for r, c1, c2 in outside_runs
+    )
 
     tbl.setStyle(TableStyle(style_commands))
     story.append(tbl)
@@ -256,7 +335,8 @@ def build_semester_calendar_pdf(
     slots: list[dict],
     num_months: int = 3,
     start_date: date = None,
-) -> bytes:
+    out: BinaryIO | None = None,
+) -> bytes | None:
     """Generate a multi-month semester calendar PDF.
 
     Each month gets its own landscape page with a wall-calendar grid.
@@ -268,26 +348,27 @@ def build_semester_calendar_pdf(
         slots: All weekly schedule slots with course_code, course_title, etc.
         num_months: Number of months to generate (default 3)
         start_date: Semester start date (defaults to start of current month)
+        out: Optional writable binary file object; the PDF is written
+            straight into it instead of an in-memory buffer
 
-    Returns: PDF as bytes
+    Returns: PDF as bytes, or None when written to ``out``
     """
-    buffer = BytesIO()
+    buffer = out if out is not None else BytesIO()
     styles = get_evlin_styles()
 
+    # One sort up front (caller's list untouched) so per-course groupings
+    # come out in day/time order without sorting each group
+    slot_rows = _slot_rows(slots)
+    course_info = _course_info_by_code(schedules)
+
     student_name = f"{student['first_name']} {student['last_name']}"
 
     if start_date is None:
         today = date.today()
         start_date = today.replace(day=1)
 
-    end_date = start_date
-    for _ in range(num_months):
-        # Advance to next month
-        if end_date.month == 12:
-            end_date = end_date.replace(year=end_date.year + 1, month=1, day=1)
-        else:
-            end_date = end_date.replace(month=end_date.month + 1, day=1)
-    end_date = end_date - timedelta(days=1)  # last day of final month
+    # Last day of the final month
+    end_date = _first_of_month(start_date, num_months) - timedelta(days=1)
 
     start_str = start_date.strftime("%b %Y")
     end_str = end_date.strftime("%b %Y")
@@ -318,29 +399,22 @@ def build_semester_calendar_pdf(
     if schedules:
         story.append(Paragraph("Enrolled Courses", styles["EvlinH2"]))
 
-        legend_data = [["Code", "Course", "Subject", "Hrs/Wk", "Schedule"]]
-        for sch in schedules:
-            c = sch.get("courses", {})
-            code = c.get("code", "")
-            subj = c.get("subject", "")
+        # Slots per course code; slot_rows is already in (code, day, time) order
+        slots_by_code: dict[str, list] = {}
+        for code, dow, time_str, _ in slot_rows:
+            slots_by_code.setdefault(code, []).append((dow, time_str))
 
+        legend_data = [["Code", "Course", "Subject", "Hrs/Wk", "Schedule"]]
+        for code, (title, subj, hours, _) in course_info.items():
             # Build schedule description from slots
-            sch_slots = [s for s in slots if s.get("course_code") == code]
+            sch_slots = slots_by_code.get(code, ())
             day_names_short = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
             sched_parts = []
-            for s in sorted(sch_slots, key=lambda x: x.get("day_of_week", 0)):
-                dn = day_names_short[s["day_of_week"]]
-                t = str(s.get("start_time", ""))[:5]
-                sched_parts.append(f"{dn} {t}")
+            for dow, t in sch_slots:
+                sched_parts.append(f"{day_names_short[dow]} {t}")
             sched_str = ", ".join(sched_parts) if sched_parts else "TBD"
 
-            legend_data.append([
-                code,
-                c.get("title", ""),
-                subj,
-                str(c.get("hours_per_week", "")),
-                sched_str,
-            ])
+            legend_data.append([code, title, subj, hours, sched_str])
 
         legend_tbl = Table(
             legend_data,
@@ -348,25 +422,22 @@ def build_semester_calendar_pdf(
         )
         legend_tbl.setStyle(TableStyle([
             ("BACKGROUND", (0, 0), (-1, 0), EVLIN_NAVY),
-            ("TEXTCOLOR", (0, 0), (-1, 0), HexColor("#FFFFFF")),
+            ("TEXTCOLOR", (0, 0), (-1, 0), EVLIN_WHITE),
             ("FONTNAME", (0, 0), (-1, 0), HEADING_FONT),
             ("FONTSIZE", (0, 0), (-1, -1), 9),
             ("PADDING", (0, 0), (-1, -1), 5),
             ("GRID", (0, 0), (-1, -1), 0.5, EVLIN_LIGHT_BLUE),
-            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [HexColor("#FFFFFF"), EVLIN_GRAY]),
+            ("ROWBACKGROUNDS", (0, 1), (-1, -1), [EVLIN_WHITE, EVLIN_GRAY]),
             ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
         ]))
         story.append(legend_tbl)
 
         # Color legend
         story.append(Spacer(1, 0.15 * inch))
-        subjects_in_use = set()
-        for sch in schedules:
-            subjects_in_use.add(sch.get("courses", {}).get("subject", ""))
+        subjects_in_use = {subj: fg for _, subj, _, fg in course_info.values()}
 
         color_parts = []
-        for subj in sorted(subjects_in_use):
-            fg, _ = SUBJECT_COLORS.get(subj, ("#333", "#FFF"))
+        for subj, fg in sorted(subjects_in_use.items()):
             color_parts.append(f'<font color="{fg}"><b>■</b></font> {subj}')
         if color_parts:
             story.append(Paragraph(
@@ -383,25 +454,25 @@ def build_semester_calendar_pdf(
         story.append(Paragraph("No active courses enrolled.", styles["EvlinBody"]))
 
     # ── Monthly Calendar Pages ───────────────────────
-    cur = start_date
+    slot_by_dow = _index_slots(slot_rows, course_info)
+    header_row = [Paragraph(html, styles["Normal"]) for html in _DAY_HEADER_HTML]
+    day_cells: dict[tuple, Paragraph] = {}
     for i in range(num_months):
+        cur = _first_of_month(start_date, i)
         story.append(PageBreak())
         month_story = _build_month_page(
             year=cur.year,
             month=cur.month,
-            slots=slots,
-            schedules=schedules,
+            slot_by_dow=slot_by_dow,
             styles=styles,
+            header_row=header_row,
+            day_cells=day_cells,
             start_date=start_date,
             end_date=end_date,
         )
         story.extend(month_story)
 
-        # Advance to next month
-        if cur.month == 12:
-            cur = cur.replace(year=cur.year + 1, month=1)
-        else:
-            cur = cur.replace(month=cur.month + 1)
-
     doc.build(story)
+    if out is not None:
+        return None
     return buffer.getvalue()
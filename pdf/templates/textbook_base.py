@@ -1,17 +1,38 @@
 """Base textbook document class with consistent header/footer."""
 from __future__ import annotations
-from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame
+from reportlab.platypus import BaseDocTemplate, PageTemplate, Frame, Spacer, HRFlowable
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
-from reportlab.lib.colors import HexColor
 
 from pdf.styles import (
-    EVLIN_NAVY, EVLIN_BLUE, EVLIN_LIGHT_BLUE, EVLIN_DARK_GRAY,
+    EVLIN_NAVY, EVLIN_BLUE, EVLIN_LIGHT_BLUE, EVLIN_DARK_GRAY, EVLIN_WHITE,
     PAGE_MARGIN, HEADING_FONT, BODY_FONT,
 )
 
 PAGE_WIDTH, PAGE_HEIGHT = letter
 
+# Standard spacers and rules. These are factories, not shared instances:
+# layout stores state on a flowable (canv while drawing, wrapped width,
+# _postponed), so each placement needs its own object.
+def spacer_small() -> Spacer:
+    return Spacer(1, 0.05 * inch)
+
+
+def spacer_med() -> Spacer:
+    return Spacer(1, 0.1 * inch)
+
+
+def spacer_lg() -> Spacer:
+    return Spacer(1, 0.2 * inch)
+
+
+def spacer_xl() -> Spacer:
+    return Spacer(1, 0.3 * inch)
+
+
+def hr_light() -> HRFlowable:
+    return HRFlowable(width="100%", thickness=0.5, color=EVLIN_LIGHT_BLUE)
+
 
 class EvlinTextbookDoc(BaseDocTemplate):
     """Base document with Evlin-branded header and footer."""
@@ -20,6 +41,14 @@ class EvlinTextbookDoc(BaseDocTemplate):
         self.doc_title = title
         self.doc_subtitle = subtitle
 
+        # Header/footer geometry is the same on every page; work it out once
+        # so _draw_page only issues canvas calls.
+        margin = PAGE_MARGIN
+        self._header_y = PAGE_HEIGHT - margin
+        self._footer_y = PAGE_MARGIN - 0.1 * inch
+        self._header_rect = (margin, self._header_y - 2, PAGE_WIDTH - 2 * margin, 24)
+        self._title_text = title[:60]
+
         super().__init__(
             filename,
             pagesize=letter,
@@ -60,21 +89,20 @@ class EvlinTextbookDoc(BaseDocTemplate):
         margin = PAGE_MARGIN
 
         # ── Header ────────────────────────────────────────
-        header_y = PAGE_HEIGHT - PAGE_MARGIN
+        header_y = self._header_y
 
         # Header background bar
         canvas.setFillColor(EVLIN_NAVY)
-        canvas.rect(margin, header_y - 2, width - 2 * margin, 24, fill=1, stroke=0)
+        canvas.rect(*self._header_rect, fill=1, stroke=0)
 
         # Title in header
-        canvas.setFillColor(HexColor("#FFFFFF"))
+        canvas.setFillColor(EVLIN_WHITE)
         canvas.setFont(HEADING_FONT, 10)
-        canvas.drawString(margin + 8, header_y + 4, f"EVLIN EDUCATION")
+        canvas.drawString(margin + 8, header_y + 4, "EVLIN EDUCATION")
 
         # Document title on right
         canvas.setFont(BODY_FONT, 9)
-        title_text = self.doc_title[:60]
-        canvas.drawRightString(width - margin - 8, header_y + 4, title_text)
+        canvas.drawRightString(width - margin - 8, header_y + 4, self._title_text)
 
         # Thin accent line below header
         canvas.setStrokeColor(EVLIN_BLUE)
@@ -82,7 +110,7 @@ class EvlinTextbookDoc(BaseDocTemplate):
         canvas.line(margin, header_y - 4, width - margin, header_y - 4)
 
         # ── Footer ────────────────────────────────────────
-        footer_y = PAGE_MARGIN - 0.1 * inch
+        footer_y = self._footer_y
 
         # Thin line above footer
         canvas.setStrokeColor(EVLIN_LIGHT_BLUE)
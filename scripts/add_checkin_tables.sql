@@ -27,6 +27,14 @@ CREATE INDEX IF NOT EXISTS idx_session_date ON session_instances(session_date);
 CREATE INDEX IF NOT EXISTS idx_session_schedule ON session_instances(schedule_id);
 CREATE INDEX IF NOT EXISTS idx_session_status ON session_instances(status);
 
+-- Per-student reads filter by schedule_id IN (...) plus a date range or an
+-- open status; these let the planner skip rows from other schedules.
+CREATE INDEX IF NOT EXISTS idx_session_schedule_date
+    ON session_instances(schedule_id, session_date DESC);
+CREATE INDEX IF NOT EXISTS idx_session_schedule_open
+    ON session_instances(schedule_id, status)
+    WHERE status IN ('pending', 'missed');
+
 -- ============================================
 -- CHECKIN LOG (audit trail for all check-in actions)
 -- ============================================
@@ -41,3 +49,19 @@ CREATE TABLE IF NOT EXISTS checkin_log (
 );
 
 CREATE INDEX IF NOT EXISTS idx_checkin_log_session ON checkin_log(session_instance_id);
+
+-- ============================================
+-- SESSION VIEW (sessions joined with schedule owner + course fields)
+-- Lets db/queries.py read a student's sessions in one request instead of
+-- resolving schedules first and joining course info in Python.
+-- ============================================
+CREATE OR REPLACE VIEW v_session_today AS
+SELECT si.*,
+       s.student_id,
+       s.status   AS schedule_status,
+       c.code     AS course_code,
+       c.title    AS course_title,
+       c.subject
+FROM session_instances si
+JOIN schedules s ON s.id = si.schedule_id
+JOIN courses c ON c.id = s.course_id;
@@ -0,0 +1,122 @@
+-- Evlin Calendar Scheduler - Server-side RPC functions
+-- Run this in the Supabase SQL Editor AFTER add_checkin_tables.sql
+-- Called from db/queries.py via get_supabase().rpc(...)
+
+-- ============================================
+-- FIND RESCHEDULE SLOTS
+-- Same search as the Python fallback in db/queries.py: for each day in
+-- (today, today + p_days_ahead], the earliest gap in every availability
+-- window that fits the missed session's duration. Stops adding days once
+-- 10 candidates are collected; returns the top 5 by preference, then date.
+-- ============================================
+CREATE OR REPLACE FUNCTION find_reschedule_slots(
+    p_student    UUID,
+    p_session    UUID,
+    p_days_ahead INTEGER DEFAULT 14
+)
+RETURNS TABLE (date DATE, day_name TEXT, start_time TEXT, end_time TEXT, preference TEXT)
+LANGUAGE sql STABLE AS $$
+WITH missed AS (
+    SELECT si.end_time - si.start_time AS dur
+    FROM session_instances si
+    WHERE si.id = p_session
+),
+days AS (
+    SELECT d::date AS day, extract(isodow FROM d)::int - 1 AS dow
+    FROM generate_series(current_date + 1, current_date + p_days_ahead, interval '1 day') AS d
+),
+busy AS (
+    SELECT si.session_date, si.start_time, si.end_time
+    FROM session_instances si
+    JOIN schedules s ON s.id = si.schedule_id
+    WHERE s.student_id = p_student
+      AND s.status = 'active'
+      AND si.session_date BETWEEN current_date + 1 AND current_date + p_days_ahead
+      AND si.status NOT IN ('cancelled', 'rescheduled')
+),
+windows AS (
+    SELECT dy.day, dy.dow, a.start_time AS w_start, a.end_time AS w_end,
+           COALESCE(a.preference, 'available') AS preference,
+           row_number() OVER (ORDER BY dy.day, a.start_time) AS ord
+    FROM days dy
+    JOIN availability a ON a.student_id = p_student AND a.day_of_week = dy.dow
+),
+-- The earliest free start in a window is either its opening or the end of
+-- a busy session inside it, so only those points need checking.
+probes AS (
+    SELECT w.*, w.w_start AS probe FROM windows w
+    UNION
+    SELECT w.*, b.end_time AS probe
+    FROM windows w
+    JOIN busy b ON b.session_date = w.day
+               AND b.end_time > w.w_start AND b.end_time < w.w_end
+),
+fits AS (
+    SELECT DISTINCT ON (p.ord)
+           p.day, p.dow, p.probe, p.probe + m.dur AS probe_end, p.preference, p.ord
+    FROM probes p
+    CROSS JOIN missed m
+    WHERE p.probe::interval + m.dur <= p.w_end::interval
+      AND NOT EXISTS (
+          SELECT 1 FROM busy b
+          WHERE b.session_date = p.day
+            AND p.probe < b.end_time
+            AND b.start_time::interval < p.probe::interval + m.dur
+      )
+    ORDER BY p.ord, p.probe
+),
+capped AS (
+    SELECT f.*,
+           count(*) OVER (ORDER BY f.day) - count(*) OVER (PARTITION BY f.day) AS found_before
+    FROM fits f
+)
+SELECT c.day,
+       (ARRAY['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'])[c.dow + 1],
+       to_char(c.probe, 'HH24:MI'),
+       to_char(c.probe_end, 'HH24:MI'),
+       c.preference
+FROM capped c
+WHERE c.found_before < 10
+ORDER BY CASE c.preference
+             WHEN 'preferred' THEN 0
+             WHEN 'available' THEN 1
+             WHEN 'avoid' THEN 2
+             ELSE 9
+         END,
+         c.day, c.ord
+LIMIT 5;
+$$;
+
+-- ============================================
+-- APPEND CONVERSATION MESSAGE
+-- Appends to agent_conversations.messages in place so a new chat turn
+-- sends only the new message, not the full history.
+-- p_msg is a JSON array of the message(s) to append.
+-- ============================================
+CREATE OR REPLACE FUNCTION append_conversation_msg(p_id UUID, p_msg JSONB)
+RETURNS VOID
+LANGUAGE sql AS $$
+UPDATE agent_conversations
+SET messages = messages || p_msg,
+    updated_at = now()
+WHERE id = p_id;
+$$;
+
+-- ============================================
+-- GENERATE SESSIONS
+-- Expands a schedule's weekly slots into dated session_instances for every
+-- matching weekday in [p_start, p_end]. Existing (slot, date) rows are kept
+-- as-is. Returns only the newly inserted rows.
+-- ============================================
+CREATE OR REPLACE FUNCTION generate_sessions(p_schedule UUID, p_start DATE, p_end DATE)
+RETURNS SETOF session_instances
+LANGUAGE sql AS $$
+INSERT INTO session_instances (schedule_id, schedule_slot_id, session_date, start_time, end_time, status)
+SELECT ss.schedule_id, ss.id, d::date, ss.start_time, ss.end_time, 'pending'
+FROM schedule_slots ss
+CROSS JOIN generate_series(p_start, p_end, interval '1 day') AS d
+WHERE ss.schedule_id = p_schedule
+  AND extract(isodow FROM d)::int - 1 = ss.day_of_week
+ON CONFLICT (schedule_slot_id, session_date) DO NOTHING
+RETURNING *;
+$$;
@@ -50,6 +50,9 @@ CREATE TABLE availability (
     CHECK (end_time > start_time)
 );
 CREATE INDEX idx_availability_student ON availability(student_id);
+-- One row per student/day/start; lets seed_data.py upsert availability
+CREATE UNIQUE INDEX IF NOT EXISTS idx_availability_slot
+    ON availability(student_id, day_of_week, start_time);
 
 -- ============================================
 -- SCHEDULES (student <-> course enrollment)
@@ -50,20 +50,24 @@ def main() -> None:
         print("No active schedules.")
         return
 
-    past_sessions = []
-    for sch_id in schedule_ids:
-        resp = (
-            sb.table("session_instances")
-            .select("*")
-            .eq("schedule_id", sch_id)
-            .in_("status", ["completed", "missed"])
-            .lt("session_date", str(today))
-            .is_("rescheduled_to", "null")
-            .order("session_date", desc=True)
-            .limit(3)
-            .execute()
-        )
-        past_sessions.extend(resp.data)
+    # One query for all schedules, then keep up to 3 most recent per schedule.
+    # No row limit: a global cap could be used up by one busy schedule.
+    resp = (
+        sb.table("session_instances")
+        .select("*")
+        .in_("schedule_id", schedule_ids)
+        .in_("status", ["completed", "missed"])
+        .lt("session_date", str(today))
+        .is_("rescheduled_to", "null")
+        .order("session_date", desc=True)
+        .execute()
+    )
+    by_schedule: dict[str, list[dict]] = {sch_id: [] for sch_id in schedule_ids}
+    for row in resp.data:
+        bucket = by_schedule[row["schedule_id"]]
+        if len(bucket) < 3:
+            bucket.append(row)
+    past_sessions = [row for sch_id in schedule_ids for row in by_schedule[sch_id]]
 
     if len(past_sessions) < 2:
         print(f"Only {len(past_sessions)} past non-rescheduled sessions found. Need at least 2.")
@@ -73,14 +77,14 @@ def main() -> None:
     # Reset 2 past sessions back to 'pending'
     test_sessions = past_sessions[:2]
     print(f"\n--- Resetting {len(test_sessions)} past sessions to 'pending' ---")
+    sb.table("session_instances").update({
+        "status": "pending",
+        "checked_in_at": None,
+    }).in_("id", [s["id"] for s in test_sessions]).execute()
     for s in test_sessions:
         print(f"  ID:   {s['id']}")
         print(f"  Date: {s['session_date']}  {str(s['start_time'])[:5]}-{str(s['end_time'])[:5]}")
         print(f"  Was:  {s['status']}")
-        sb.table("session_instances").update({
-            "status": "pending",
-            "checked_in_at": None,
-        }).eq("id", s["id"]).execute()
         print(f"  Now:  pending")
 
     # Now call mark_missed_sessions with auto_reschedule=True
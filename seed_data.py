@@ -6,29 +6,77 @@ Usage:
     python seed_data.py --supabase   # Seed only Supabase
     python seed_data.py --neo4j      # Seed only Neo4j
     python seed_data.py --minio      # Seed only MinIO buckets
+    python seed_data.py --pinecone   # Seed only Pinecone course embeddings
+    python seed_data.py --batch-size 200 ...  # Rows per Supabase insert (default 500)
+
+Pinecone seeding skips courses whose embedding text is unchanged since the
+last run (hashes kept in .seed_cache.json); delete that file to re-embed all.
 """
-import json
+import functools
+import hashlib
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import date, timedelta
 
+try:
+    from orjson import dumps as _json_dumps, loads as _json_loads
+except ImportError:  # optional speedup; stdlib json accepts bytes too
+    import json
+    from json import loads as _json_loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
 BASE_DIR = Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 
+# Rows per Supabase bulk write; keeps each request well under the REST
+# payload limit as seed files grow
+DEFAULT_BATCH_SIZE = 500
+SEED_CACHE_FILE = BASE_DIR / ".seed_cache.json"  # course id -> embedded content hash
+
+# Gemini embedding requests in seed_pinecone: texts per request (API cap)
+# and how many requests are in flight at once
+EMBED_BATCH_SIZE = 100
+EMBED_WORKERS = 8
+
+# Text embedded for each course
+COURSE_EMBED_TEMPLATE = (
+    "{title}. {subject}. {desc}. Grade {gmin}-{gmax}. Difficulty: {diff}. Tags: {tags}"
+)
+
 # Add project root to path
 sys.path.insert(0, str(BASE_DIR))
 
-from app.config import settings
-
 
+@functools.lru_cache(maxsize=None)
 def load_json(filename: str):
-    with open(DATA_DIR / filename) as f:
-        return json.load(f)
+    """Parse a data file once per run; seeders share the result, so don't mutate it."""
+    return _json_loads((DATA_DIR / filename).read_bytes())
+
+
+def _load_seed_cache() -> dict:
+    try:
+        return _json_loads(SEED_CACHE_FILE.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_seed_cache(cache: dict):
+    SEED_CACHE_FILE.write_bytes(_json_dumps(cache))
+
+
+def chunked(seq: list, n: int):
+    """Yield successive ``n``-sized slices of ``seq``."""
+    for i in range(0, len(seq), n):
+        yield seq[i:i + n]
 
 
 # ── Supabase Seeding ──────────────────────────────────────
 
-def seed_supabase():
+def seed_supabase(batch_size: int = DEFAULT_BATCH_SIZE):
+    from postgrest.exceptions import APIError
     from services.supabase_client import get_supabase
     sb = get_supabase()
 
@@ -58,16 +106,24 @@ def seed_supabase():
         if not sid:
             print(f"  ⚠️ Student '{student_name}' not found, skipping availability")
             continue
-        for slot in slots:
-            slot["student_id"] = sid
-            all_avail.append(slot)
+        all_avail.extend({**slot, "student_id": sid} for slot in slots)
 
-    # Clear existing availability first
-    for sid in student_map.values():
-        sb.table("availability").delete().eq("student_id", sid).execute()
+    student_ids = list(student_map.values())
 
-    print(f"  Inserting {len(all_avail)} availability slots...")
-    sb.table("availability").insert(all_avail).execute()
+    print(f"  Upserting {len(all_avail)} availability slots...")
+    try:
+        for batch in chunked(all_avail, batch_size):
+            sb.table("availability").upsert(
+                batch, on_conflict="student_id,day_of_week,start_time",
+            ).execute()
+    except APIError as e:
+        if e.code != "42P10":
+            raise
+        # 42P10: no unique index matches ON CONFLICT, i.e. idx_availability_slot
+        # not created yet; clear and re-insert instead
+        sb.table("availability").delete().in_("student_id", student_ids).execute()
+        for batch in chunked(all_avail, batch_size):
+            sb.table("availability").insert(batch).execute()
     print("  ✅ Availability inserted")
 
     # Insert sample schedules for all 5 students
@@ -243,10 +299,11 @@ def seed_supabase():
     ]
 
     # Clear existing schedules (and their slots via CASCADE) so re-seeding doesn't duplicate
-    for sid in student_map.values():
-        sb.table("schedules").delete().eq("student_id", sid).execute()
+    sb.table("schedules").delete().in_("student_id", student_ids).execute()
 
     print("  Inserting sample schedules...")
+    schedules_payload = []
+    slots_by_key = {}  # (student_id, course_id) -> weekly slots
     for sched in sample_schedules:
         sid = student_map.get(sched["student_name"])
         cid = course_map.get(sched["course_code"])
@@ -254,20 +311,27 @@ def seed_supabase():
             print(f"  ⚠️ Skipping schedule: student/course not found")
             continue
 
-        sch_result = sb.table("schedules").insert({
+        schedules_payload.append({
             "student_id": sid,
             "course_id": cid,
             "status": sched["status"],
             "start_date": str(semester_start),
             "end_date": str(semester_end),
-        }).execute()
-
-        schedule_id = sch_result.data[0]["id"]
-
-        for slot in sched["slots"]:
-            slot["schedule_id"] = schedule_id
-            sb.table("schedule_slots").insert(slot).execute()
-
+        })
+        slots_by_key[(sid, cid)] = sched["slots"]
+
+    # One insert for all schedules; the returned rows carry their new ids,
+    # matched back to slots by (student, course) rather than by position
+    all_slots = []
+    if schedules_payload:
+        sch_result = sb.table("schedules").insert(schedules_payload).execute()
+        for row in sch_result.data:
+            for slot in slots_by_key.get((row["student_id"], row["course_id"]), ()):
+                all_slots.append({**slot, "schedule_id": row["id"]})
+
+    # Weekly slots, batch_size rows per request
+    for batch in chunked(all_slots, batch_size):
+        sb.table("schedule_slots").insert(batch).execute()
     print("  ✅ Sample schedules inserted")
 
     # Generate session instances for check-in tracking
@@ -311,26 +375,17 @@ def seed_supabase():
         print(f"  ✅ Demo check-in data: {completed_count} completed, {missed_count} missed")
 
     print("✅ Supabase seeding complete!\n")
-    return student_map, course_map
+    return student_map, course_map, courses
 
 
 # ── Neo4j Seeding ─────────────────────────────────────────
 
 def seed_neo4j():
-    from db.graph_queries import (
-        clear_all_graph_data,
-        create_course_node,
-        create_prerequisite_edge,
-        create_related_edge,
-    )
+    from db.graph_queries import seed_course_graph
 
     print("🔄 Seeding Neo4j...")
-    clear_all_graph_data()
 
     courses = load_json("dummy_courses.json")
-    for c in courses:
-        create_course_node(c["code"], c["title"], c["subject"])
-    print(f"  ✅ {len(courses)} course nodes created")
 
     # Prerequisite edges
     prereq_pairs = []
@@ -338,10 +393,6 @@ def seed_neo4j():
         for prereq in c.get("prerequisites", []):
             prereq_pairs.append((prereq, c["code"]))
 
-    for from_code, to_code in prereq_pairs:
-        create_prerequisite_edge(from_code, to_code)
-    print(f"  ✅ {len(prereq_pairs)} prerequisite edges created")
-
     # Related edges (cross-subject connections)
     related_pairs = [
         ("SCI-7B", "MATH-7A", "Physical science uses pre-algebra concepts"),
@@ -350,8 +401,11 @@ def seed_neo4j():
         ("ELA-8A", "HIST-7A", "Essay writing often covers historical topics"),
         ("ART-8A", "MATH-8A", "Digital art uses geometric concepts"),
     ]
-    for a, b, reason in related_pairs:
-        create_related_edge(a, b, reason)
+
+    # Clear + nodes + both edge types in a single write transaction
+    seed_course_graph(courses, prereq_pairs, related_pairs, replace=True)
+    print(f"  ✅ {len(courses)} course nodes created")
+    print(f"  ✅ {len(prereq_pairs)} prerequisite edges created")
     print(f"  ✅ {len(related_pairs)} related edges created")
     print("✅ Neo4j seeding complete!\n")
 
@@ -362,16 +416,32 @@ def seed_minio():
     from services.minio_client import ensure_bucket
 
     print("🔄 Setting up MinIO buckets...")
-    for bucket in ["evlin-pdfs", "evlin-uploads"]:
-        ensure_bucket(bucket)
-        print(f"  ✅ Bucket '{bucket}' ready")
+    buckets = ["evlin-pdfs", "evlin-uploads"]
+    # Check/create the buckets concurrently
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        for bucket, _ in zip(buckets, pool.map(ensure_bucket, buckets)):
+            print(f"  ✅ Bucket '{bucket}' ready")
     print("✅ MinIO setup complete!\n")
 
 
 # ── Pinecone Seeding (requires Gemini API for embeddings) ─
 
-def seed_pinecone():
-    """Seed Pinecone with course embeddings. Requires GEMINI_API_KEY."""
+def seed_pinecone(courses: list[dict] = None):
+    """Seed Pinecone with course embeddings. Requires GEMINI_API_KEY.
+
+    ``courses`` are Supabase course rows (with ids), e.g. as returned by
+    seed_supabase; fetched from Supabase when not given.
+    """
+    import asyncio
+
+    asyncio.run(seed_pinecone_async(courses))
+
+
+async def seed_pinecone_async(courses: list[dict] = None):
+    """Async body of seed_pinecone; embedding requests run on Gemini's aio client."""
+    import asyncio
+    from app.config import settings
+
     if not settings.gemini_api_key:
         print("⚠️ Skipping Pinecone seeding: GEMINI_API_KEY not set")
         return
@@ -379,38 +449,74 @@ def seed_pinecone():
     print("🔄 Seeding Pinecone...")
     try:
         from google import genai
-        from db.vector_queries import upsert_course_embedding
-        from services.supabase_client import get_supabase
+        from db.vector_queries import upsert_course_embeddings
 
         client = genai.Client(api_key=settings.gemini_api_key)
-        courses = get_supabase().table("courses").select("*").execute().data
-
-        for c in courses:
-            text = f"{c['title']}. {c['subject']}. {c.get('description', '')}. " \
-                   f"Grade {c['grade_level_min']}-{c['grade_level_max']}. " \
-                   f"Difficulty: {c['difficulty']}. Tags: {', '.join(c.get('tags', []))}"
-
-            response = client.models.embed_content(
-                model="models/text-embedding-004",
-                content=text,
-            )
-            embedding = response.embeddings[0].values
-
-            upsert_course_embedding(
-                course_id=c["id"],
-                embedding=embedding,
-                metadata={
-                    "code": c["code"],
-                    "title": c["title"],
-                    "subject": c["subject"],
-                    "grade_level_min": c["grade_level_min"],
-                    "grade_level_max": c["grade_level_max"],
-                    "difficulty": c["difficulty"],
-                },
+        if courses is None:
+            from services.supabase_client import get_supabase
+            courses = get_supabase().table("courses").select("*").execute().data
+
+        fmt = COURSE_EMBED_TEMPLATE.format
+        texts = [
+            fmt(
+                title=c["title"], subject=c["subject"], desc=c.get("description", ""),
+                gmin=c["grade_level_min"], gmax=c["grade_level_max"],
+                diff=c["difficulty"], tags=", ".join(c.get("tags", [])),
             )
+            for c in courses
+        ]
+
+        # Skip courses whose embedded content (text + metadata code) matches
+        # what the last run upserted
+        cache = _load_seed_cache()
+        hashes = [
+            hashlib.sha256(f"{c['code']}\0{text}".encode()).hexdigest()
+            for c, text in zip(courses, texts)
+        ]
+        todo = [i for i, c in enumerate(courses) if cache.get(c["id"]) != hashes[i]]
+        if not todo:
+            print(f"✅ Pinecone up to date ({len(courses)} courses unchanged)\n")
+            return
+        courses = [courses[i] for i in todo]
+        texts = [texts[i] for i in todo]
+        hashes = [hashes[i] for i in todo]
+
+        in_flight = asyncio.Semaphore(EMBED_WORKERS)
+
+        async def embed(batch):
+            async with in_flight:
+                response = await client.aio.models.embed_content(
+                    model="models/text-embedding-004",
+                    contents=batch,
+                )
+            return [e.values for e in response.embeddings]
+
+        # One request per EMBED_BATCH_SIZE texts; batches are independent
+        # network round-trips, so overlap them
+        batches = [
+            texts[i:i + EMBED_BATCH_SIZE] for i in range(0, len(texts), EMBED_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(embed(batch) for batch in batches))
+        embeddings = [e for batch in results for e in batch]
+
+        vectors = []
+        for c, embedding in zip(courses, embeddings):
+            vectors.append((c["id"], embedding, {
+                "code": c["code"],
+                "title": c["title"],
+                "subject": c["subject"],
+                "grade_level_min": c["grade_level_min"],
+                "grade_level_max": c["grade_level_max"],
+                "difficulty": c["difficulty"],
+            }))
             print(f"  ✅ Embedded: {c['code']} - {c['title']}")
 
-        print(f"✅ Pinecone seeding complete ({len(courses)} courses)!\n")
+        # Sent UPSERT_BATCH_SIZE vectors per request
+        await asyncio.to_thread(upsert_course_embeddings, vectors)
+        for c, h in zip(courses, hashes):
+            cache[c["id"]] = h
+        _save_seed_cache(cache)
+        print(f"✅ Pinecone seeding complete ({len(courses)} courses embedded)!\n")
     except Exception as e:
         print(f"⚠️ Pinecone seeding failed: {e}\n")
 
@@ -418,20 +524,39 @@ def seed_pinecone():
 # ── Main ──────────────────────────────────────────────────
 
 def main():
-    args = set(sys.argv[1:])
+    argv = sys.argv[1:]
+    batch_size = DEFAULT_BATCH_SIZE
+    if "--batch-size" in argv:
+        i = argv.index("--batch-size")
+        try:
+            batch_size = int(argv[i + 1])
+        except (IndexError, ValueError):
+            sys.exit("--batch-size needs a positive integer")
+        if batch_size < 1:
+            sys.exit("--batch-size needs a positive integer")
+        del argv[i:i + 2]
+    args = set(argv)
     run_all = not args
 
-    if run_all or "--supabase" in args:
-        seed_supabase()
+    # Neo4j and MinIO don't depend on anything else, so they run alongside
+    # Supabase; Pinecone needs the seeded course rows and starts after it.
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = []
+        if run_all or "--neo4j" in args:
+            futures.append(pool.submit(seed_neo4j))
+
+        if run_all or "--minio" in args:
+            futures.append(pool.submit(seed_minio))
 
-    if run_all or "--neo4j" in args:
-        seed_neo4j()
+        courses = None  # Supabase course rows, reused by Pinecone when seeded here
+        if run_all or "--supabase" in args:
+            _, _, courses = seed_supabase(batch_size)
 
-    if run_all or "--minio" in args:
-        seed_minio()
+        if run_all or "--pinecone" in args:
+            futures.append(pool.submit(seed_pinecone, courses))
 
-    if run_all or "--pinecone" in args:
-        seed_pinecone()
+        for future in as_completed(futures):
+            future.result()  # re-raise a seeder's failure here
 
     print("🎉 Seeding complete!")
 
@@ -1,23 +1,34 @@
+import threading
 from typing import Optional
 from minio import Minio
 from app.config import settings
 
 _client: Optional[Minio] = None
+_client_lock = threading.Lock()
+
+# Buckets confirmed to exist in this process; uploads call ensure_bucket
+# every time, so skip the HEAD request once a bucket is known.
+_known_buckets: set[str] = set()
 
 
 def get_minio() -> Minio:
     global _client
     if _client is None:
-        _client = Minio(
-            settings.minio_endpoint,
-            access_key=settings.minio_access_key,
-            secret_key=settings.minio_secret_key,
-            secure=settings.minio_secure,
-        )
+        with _client_lock:
+            if _client is None:
+                _client = Minio(
+                    settings.minio_endpoint,
+                    access_key=settings.minio_access_key,
+                    secret_key=settings.minio_secret_key,
+                    secure=settings.minio_secure,
+                )
     return _client
 
 
 def ensure_bucket(bucket_name: str):
+    if bucket_name in _known_buckets:
+        return
     client = get_minio()
     if not client.bucket_exists(bucket_name):
         client.make_bucket(bucket_name)
+    _known_buckets.add(bucket_name)
@@ -26,3 +26,17 @@ def run_query(query: str, parameters: dict = None):
     with driver.session() as session:
         result = session.run(query, parameters or {})
         return [record.data() for record in result]
+
+
+def run_queries(queries: list[tuple[str, dict]]) -> list[list[dict]]:
+    """Run several write queries in one session and one transaction.
+
+    Saves a session (and commit) per query for multi-step writes such as
+    seeding. Returns each query's records in order.
+    """
+    def _work(tx):
+        return [[record.data() for record in tx.run(q, p or {})] for q, p in queries]
+
+    driver = get_neo4j_driver()
+    with driver.session() as session:
+        return session.execute_write(_work)
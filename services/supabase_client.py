@@ -1,16 +1,44 @@
+import threading
 from typing import Optional
-from supabase import create_client, Client
+import httpx
+from supabase import create_client, Client, ClientOptions
 from app.config import settings
 
 _client: Optional[Client] = None
+_client_lock = threading.Lock()
+
+# One pooled HTTP/2 connection set is shared by every PostgREST call, so
+# bursts (weekly strip, check-in stats) pay a single TLS handshake. Idle
+# connections expire before the server drops them, and a connect failure on
+# a stale socket is retried once.
+_HTTP_TIMEOUT = 120
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=50,
+    keepalive_expiry=60,
+)
 
 
 def get_supabase() -> Client:
     global _client
     if _client is None:
-        if not settings.supabase_url or not settings.supabase_key:
-            raise ValueError(
-                "SUPABASE_URL and SUPABASE_KEY must be set in .env"
-            )
-        _client = create_client(settings.supabase_url, settings.supabase_key)
+        with _client_lock:
+            if _client is None:
+                if not settings.supabase_url or not settings.supabase_key:
+                    raise ValueError(
+                        "SUPABASE_URL and SUPABASE_KEY must be set in .env"
+                    )
+                http_client = httpx.Client(
+                    transport=httpx.HTTPTransport(http2=True, limits=_HTTP_LIMITS, retries=1),
+                    timeout=_HTTP_TIMEOUT,
+                )
+                _client = create_client(
+                    settings.supabase_url,
+                    settings.supabase_key,
+                    options=ClientOptions(
+                        schema="public",
+                        postgrest_client_timeout=_HTTP_TIMEOUT,
+                        httpx_client=http_client,
+                    ),
+                )
     return _client